@@ -59,12 +59,12 @@ def rlm_assemble(
     return RlmAssembleResp(**result)
 
 @router.post("/run", response_model=RlmRunResp)
-def rlm_run(
+async def rlm_run(
     req: RlmRunReq,
     service: RlmRunService = Depends(get_rlm_run_service),
 ) -> RlmRunResp:
     try:
-        result = service.run(req.session_id, req.query, req.options)
+        result = await service.arun(req.session_id, req.query, req.options)
     except RlmServiceError as exc:
         raise HTTPException(status_code=exc.status_code, detail=exc.detail) from exc
 
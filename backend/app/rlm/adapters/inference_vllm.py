@@ -165,7 +165,7 @@ class InferenceVllmAdapter(InferenceAdapter):
             messages = [{"role": "user", "content": prompt}]
 
         client = self._client
-        if timeout_s is not None:
+        if timeout_s is not None and timeout_s != self._retry.timeout_s:
             override_retry = replace(self._retry, timeout_s=timeout_s)
             client = VllmChatCompletionsClient(
                 self._base_url,
@@ -2,13 +2,24 @@ from __future__ import annotations
 
 import json
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, Callable
 
 from sqlalchemy import text
 from sqlalchemy.engine import Engine
 
 from app.rlm.domain.models import Candidate, CandidateIndex
 
+try:
+    import msgspec
+except ImportError:  # optional fast JSON codec; stdlib json is the fallback
+    msgspec = None
+
+
+def _default_json_dumps(value: Any) -> str:
+    if msgspec is not None:
+        return msgspec.json.encode(value).decode("utf-8")
+    return json.dumps(value)
+
 
 class ArtifactRepo:
     """
@@ -51,14 +62,33 @@ class RetrievalOptions:
     allowed_types: list[str] = field(default_factory=list)
 
 
+_RUN_PAYLOAD_JSONB_COLUMNS = frozenset(
+    {
+        "program",
+        "meta",
+        "events",
+        "glimpses",
+        "glimpses_meta",
+        "subcalls",
+        "evidence",
+        "final",
+        "citations",
+        "errors",
+    }
+)
+_RUN_PAYLOAD_TEXT_COLUMNS = frozenset({"final_answer", "status"})
+
+
 class RlmRepoSQL:
     """
     只做“集中 SQL”，不引入 ORM，不做额外 DB helper。
     Engine/Connection 由上游 deps.py 提供。
+    dumps: jsonb 参数的序列化函数（默认 msgspec，缺失时回退 json.dumps）。
     """
 
-    def __init__(self, engine: Engine):
+    def __init__(self, engine: Engine, *, dumps: Callable[[Any], str] | None = None):
         self.engine = engine
+        self._dumps = dumps or _default_json_dumps
 
     # --- helpers ---
     def _get_project_id_by_session(self, session_id: str) -> str:
@@ -260,8 +290,8 @@ class RlmRepoSQL:
                 {
                     "session_id": session_id,
                     "query": query,
-                    "options": json.dumps(options),
-                    "candidate_index": json.dumps(candidate_index),
+                    "options": self._dumps(options),
+                    "candidate_index": self._dumps(candidate_index),
                 },
             ).mappings().one()
             return row["id"]
@@ -297,9 +327,9 @@ class RlmRepoSQL:
                 ),
                 {
                     "run_id": run_id,
-                    "round_payload": json.dumps(round_payload),
-                    "llm_raw_append": json.dumps(llm_raw_append),
-                    "errors_append": json.dumps(errors_append),
+                    "round_payload": self._dumps(round_payload),
+                    "llm_raw_append": self._dumps(llm_raw_append),
+                    "errors_append": self._dumps(errors_append),
                 },
             )
 
@@ -313,30 +343,30 @@ class RlmRepoSQL:
 
         if "program" in patch_jsonb:
             update_clauses.append("program = CAST(:program AS jsonb)")
-            params["program"] = json.dumps(patch_jsonb.get("program") or [])
+            params["program"] = self._dumps(patch_jsonb.get("program") or [])
         if "program_meta" in patch_jsonb:
             update_clauses.append("program_meta = CAST(:program_meta AS jsonb)")
-            params["program_meta"] = json.dumps(patch_jsonb.get("program_meta") or {})
+            params["program_meta"] = self._dumps(patch_jsonb.get("program_meta") or {})
         if "events" in patch_jsonb:
             update_clauses.append(
                 "events = COALESCE(events, '[]'::jsonb) || CAST(:events AS jsonb)"
             )
-            params["events"] = json.dumps(events_payload)
+            params["events"] = self._dumps(events_payload)
         if "glimpses" in patch_jsonb:
             update_clauses.append(
                 "glimpses = COALESCE(glimpses, '[]'::jsonb) || CAST(:glimpses AS jsonb)"
             )
-            params["glimpses"] = json.dumps(self._normalize_list_payload(patch_jsonb.get("glimpses")))
+            params["glimpses"] = self._dumps(self._normalize_list_payload(patch_jsonb.get("glimpses")))
         if "subcalls" in patch_jsonb:
             update_clauses.append(
                 "subcalls = COALESCE(subcalls, '[]'::jsonb) || CAST(:subcalls AS jsonb)"
             )
-            params["subcalls"] = json.dumps(self._normalize_list_payload(patch_jsonb.get("subcalls")))
+            params["subcalls"] = self._dumps(self._normalize_list_payload(patch_jsonb.get("subcalls")))
         if "evidence" in patch_jsonb:
             update_clauses.append(
                 "evidence = COALESCE(evidence, '[]'::jsonb) || CAST(:evidence AS jsonb)"
             )
-            params["evidence"] = json.dumps(self._normalize_list_payload(patch_jsonb.get("evidence")))
+            params["evidence"] = self._dumps(self._normalize_list_payload(patch_jsonb.get("evidence")))
         if "final_answer" in patch_jsonb:
             update_clauses.append("final_answer = :final_answer")
             params["final_answer"] = patch_jsonb.get("final_answer")
@@ -344,18 +374,18 @@ class RlmRepoSQL:
             update_clauses.append(
                 "citations = COALESCE(citations, '[]'::jsonb) || CAST(:citations AS jsonb)"
             )
-            params["citations"] = json.dumps(self._normalize_list_payload(patch_jsonb.get("citations")))
+            params["citations"] = self._dumps(self._normalize_list_payload(patch_jsonb.get("citations")))
         if "options" in patch_jsonb:
             update_clauses.append("options = CAST(:options AS jsonb)")
-            params["options"] = json.dumps(patch_jsonb.get("options") or {})
+            params["options"] = self._dumps(patch_jsonb.get("options") or {})
         if "candidate_index" in patch_jsonb:
             update_clauses.append("candidate_index = CAST(:candidate_index AS jsonb)")
-            params["candidate_index"] = json.dumps(patch_jsonb.get("candidate_index") or {})
+            params["candidate_index"] = self._dumps(patch_jsonb.get("candidate_index") or {})
         if "errors" in patch_jsonb:
             update_clauses.append(
                 "errors = COALESCE(errors, '[]'::jsonb) || CAST(:errors AS jsonb)"
             )
-            params["errors"] = json.dumps(self._normalize_list_payload(patch_jsonb.get("errors")))
+            params["errors"] = self._dumps(self._normalize_list_payload(patch_jsonb.get("errors")))
         if "status" in patch_jsonb:
             update_clauses.append("status = :status")
             params["status"] = patch_jsonb.get("status")
@@ -373,7 +403,7 @@ class RlmRepoSQL:
                         """
                     ),
                     [
-                        {"run_id": run_id, "event": json.dumps(event)}
+                        {"run_id": run_id, "event": self._dumps(event)}
                         for event in events_payload
                     ],
                 )
@@ -415,71 +445,52 @@ class RlmRepoSQL:
                 ),
                 {
                     "run_id": run_id,
-                    "assembled_context": json.dumps(assembled_context),
+                    "assembled_context": self._dumps(assembled_context),
                     "rendered_prompt": rendered_prompt,
                     "status": status,
-                    "errors": json.dumps(errors),
+                    "errors": self._dumps(errors),
                 },
             )
 
-    def update_run_payload(
-        self,
-        run_id: str,
-        *,
-        program: dict,
-        meta: dict,
-        events: list[dict],
-        glimpses: list[dict],
-        glimpses_meta: list[dict],
-        subcalls: list[dict],
-        evidence: list[dict],
-        final: dict,
-        final_answer: str | None,
-        citations: list[Any],
-        status: str,
-        errors: list[dict] | dict | None = None,
-    ) -> None:
-        if isinstance(errors, dict):
-            errors = [errors]
-        errors = errors or []
+    def update_run_payload(self, run_id: str, **fields: Any) -> None:
+        """
+        只更新传入的列（按阶段增量写入），未传入的列保持原值。
+        可用列见 _RUN_PAYLOAD_JSONB_COLUMNS / _RUN_PAYLOAD_TEXT_COLUMNS。
+        """
+        if not fields:
+            return
+        unknown = set(fields) - _RUN_PAYLOAD_JSONB_COLUMNS - _RUN_PAYLOAD_TEXT_COLUMNS
+        if unknown:
+            raise ValueError(f"unknown rlm_runs payload columns: {sorted(unknown)}")
+
+        if "errors" in fields:
+            errors = fields["errors"]
+            if isinstance(errors, dict):
+                errors = [errors]
+            fields["errors"] = errors or []
+
+        update_clauses: list[str] = []
+        params: dict[str, Any] = {"run_id": run_id}
+        for column, value in fields.items():
+            if column in _RUN_PAYLOAD_JSONB_COLUMNS:
+                update_clauses.append(f"{column} = CAST(:{column} AS jsonb)")
+                params[column] = self._dumps(value)
+            else:
+                update_clauses.append(f"{column} = :{column}")
+                params[column] = value
 
         with self.engine.begin() as conn:
             conn.execute(
                 text(
-                    """
+                    f"""
                     UPDATE rlm_runs
-                    SET
-                        program = CAST(:program AS jsonb),
-                        meta = CAST(:meta AS jsonb),
-                        events = CAST(:events AS jsonb),
-                        glimpses = CAST(:glimpses AS jsonb),
-                        glimpses_meta = CAST(:glimpses_meta AS jsonb),
-                        subcalls = CAST(:subcalls AS jsonb),
-                        evidence = CAST(:evidence AS jsonb),
-                        final = CAST(:final AS jsonb),
-                        final_answer = :final_answer,
-                        citations = CAST(:citations AS jsonb),
-                        status = :status,
-                        errors = CAST(:errors AS jsonb)
+                    SET {", ".join(update_clauses)}
                     WHERE id = :run_id
                     """
                 ),
-                {
-                    "run_id": run_id,
-                    "program": json.dumps(program),
-                    "meta": json.dumps(meta),
-                    "events": json.dumps(events),
-                    "glimpses": json.dumps(glimpses),
-                    "glimpses_meta": json.dumps(glimpses_meta),
-                    "subcalls": json.dumps(subcalls),
-                    "evidence": json.dumps(evidence),
-                    "final": json.dumps(final),
-                    "final_answer": final_answer,
-                    "citations": json.dumps(citations),
-                    "status": status,
-                    "errors": json.dumps(errors),
-                },
+                params,
             )
+
     @staticmethod
     def _normalize_list_payload(payload: Any) -> list[Any]:
         if payload is None:
@@ -10,7 +10,7 @@ from app.deps import get_engine
 from app.rlm.adapters.repos_sql import RlmRepoSQL
 from app.rlm.services.assembly_runner import build_limits_snapshot, run_program
 from app.rlm.services.retrieval import build_candidate_index
-from app.rlm.services.run_pipeline import run_rlm
+from app.rlm.services.run_pipeline import RunResult, arun_rlm, run_rlm
 
 
 @dataclass(frozen=True)
@@ -49,7 +49,7 @@ class RlmAssembleService:
             session_id=session_id,
             query=query,
             options=options_snapshot,
-            candidate_index=idx.model_dump(),
+            candidate_index=idx.dump,
         )
 
         outcome = run_program(idx, options_snapshot, limits=limits)
@@ -88,16 +88,36 @@ class RlmRunService:
         except ValueError as exc:
             raise RlmServiceError(status_code=404, detail=str(exc)) from exc
 
-        return {
-            "run_id": result.run_id,
-            "status": result.status,
-            "program": result.program,
-            "glimpses": result.glimpses,
-            "subcalls": result.subcalls,
-            "final_answer": result.final_answer,
-            "citations": result.citations,
-            "final": result.final,
-        }
+        return _run_result_payload(result)
+
+    async def arun(
+        self,
+        session_id: str,
+        query: str,
+        options: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        if not query.strip():
+            raise RlmServiceError(status_code=400, detail="empty_query_not_allowed")
+
+        try:
+            result = await arun_rlm(self.repo, session_id, query, options)
+        except ValueError as exc:
+            raise RlmServiceError(status_code=404, detail=str(exc)) from exc
+
+        return _run_result_payload(result)
+
+
+def _run_result_payload(result: RunResult) -> dict[str, Any]:
+    return {
+        "run_id": result.run_id,
+        "status": result.status,
+        "program": result.program,
+        "glimpses": result.glimpses,
+        "subcalls": result.subcalls,
+        "final_answer": result.final_answer,
+        "citations": result.citations,
+        "final": result.final,
+    }
 
 
 def get_rlm_assemble_service(engine: Engine = Depends(get_engine)) -> RlmAssembleService:
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from functools import cached_property
 from typing import Any, Optional
 from pydantic import BaseModel, Field
 
@@ -29,3 +30,13 @@ class CandidateIndex(BaseModel):
     project_id: str
     query: str
     candidates: list[Candidate]
+
+    # 构建后视为只读；只计算一次（cached_property 不进入 model_dump）
+    @cached_property
+    def candidate_ids(self) -> tuple[str, ...]:
+        return tuple(candidate.artifact_id for candidate in self.candidates)
+
+    # 同一 index 会落库并在多处序列化：只 dump 一次，调用方不得修改返回值
+    @cached_property
+    def dump(self) -> dict[str, Any]:
+        return self.model_dump()
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
+import heapq
 import json
 from dataclasses import dataclass
-from typing import Any, Iterable
+from typing import Any, Iterable, Iterator
 
 from app.rlm.domain.models import Candidate, CandidateIndex
 from app.rlm.services.executor import ExecutionLimits, ProgramExecutor
@@ -17,6 +18,9 @@ _DEFAULT_LIMITS = {
 }
 
 
+_EXHAUSTED = object()
+
+
 class ProgramParseError(ValueError):
     pass
 
@@ -29,7 +33,7 @@ class ProgramLimitError(ValueError):
         self.max_value = max_value
 
 
-@dataclass
+@dataclass(slots=True)
 class RunnerOutcome:
     status: str
     assembled_context: dict[str, Any]
@@ -102,37 +106,44 @@ def _check_limits(program: Iterable[dict[str, Any]], limits: dict[str, int]) ->
     step_count = 0
     subcall_count = 0
 
-    def _walk(steps: Iterable[dict[str, Any]], depth: int) -> None:
-        nonlocal step_count, subcall_count
-        if depth > max_depth:
-            raise ProgramLimitError("max_depth", depth, max_depth)
-        for step in steps:
-            step_count += 1
-            if step_count > max_steps:
-                raise ProgramLimitError("max_steps", step_count, max_steps)
-            subcalls = step.get("subcalls") or []
-            if subcalls:
-                if not isinstance(subcalls, list):
-                    raise ProgramParseError("subcalls must be a list")
-                subcall_count += len(subcalls)
-                if subcall_count > max_subcalls:
-                    raise ProgramLimitError("max_subcalls", subcall_count, max_subcalls)
-                _walk(subcalls, depth + 1)
-
-    _walk(list(program), depth=1)
+    if max_depth < 1:
+        raise ProgramLimitError("max_depth", 1, max_depth)
+    # Explicit depth-first stack of (remaining steps, depth); same visiting
+    # order as the recursive walk, without a Python frame per nesting level.
+    stack: list[tuple[Iterator[dict[str, Any]], int]] = [(iter(program), 1)]
+    while stack:
+        steps, depth = stack[-1]
+        step = next(steps, _EXHAUSTED)
+        if step is _EXHAUSTED:
+            stack.pop()
+            continue
+        step_count += 1
+        if step_count > max_steps:
+            raise ProgramLimitError("max_steps", step_count, max_steps)
+        subcalls = step.get("subcalls") or []
+        if subcalls:
+            if not isinstance(subcalls, list):
+                raise ProgramParseError("subcalls must be a list")
+            subcall_count += len(subcalls)
+            if subcall_count > max_subcalls:
+                raise ProgramLimitError("max_subcalls", subcall_count, max_subcalls)
+            if depth + 1 > max_depth:
+                raise ProgramLimitError("max_depth", depth + 1, max_depth)
+            stack.append((iter(subcalls), depth + 1))
+
+
+def _fallback_sort_key(candidate: Candidate) -> tuple[bool, float, float, float]:
+    return (
+        candidate.pinned,
+        candidate.weight,
+        float(candidate.score_breakdown.get("hit_count") or 0.0),
+        candidate.base_score,
+    )
 
 
 def _fallback_candidates(index: CandidateIndex, *, top_k: int) -> list[Candidate]:
-    return sorted(
-        index.candidates,
-        key=lambda candidate: (
-            candidate.pinned,
-            candidate.weight,
-            float(candidate.score_breakdown.get("hit_count") or 0.0),
-            candidate.base_score,
-        ),
-        reverse=True,
-    )[:top_k]
+    # Same result as sorted(..., reverse=True)[:top_k], ties included, without a full sort.
+    return heapq.nlargest(top_k, index.candidates, key=_fallback_sort_key)
 
 
 def deterministic_fallback(index: CandidateIndex, *, top_k: int) -> dict[str, Any]:
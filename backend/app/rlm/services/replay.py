@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import json
+import sys
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+try:
+    import msgspec
+except ImportError:  # optional fast JSON codec; stdlib json is the fallback
+    msgspec = None
+
+if msgspec is not None:
+
+    class _TraceLine(msgspec.Struct):
+        # Only the fields replay prints; "meta" and unknown keys are skipped
+        # by the decoder instead of being materialized.
+        stage: str = ""
+        payload: Any = msgspec.field(default_factory=dict)
+        ts_ns: Any = None
+        ts: Any = None
+
+    _LINE_DECODER = msgspec.json.Decoder(_TraceLine)
+    _DECODE_ERRORS: tuple[type[Exception], ...] = (msgspec.DecodeError,)
+else:
+    _LINE_DECODER = None
+    _DECODE_ERRORS = (json.JSONDecodeError, UnicodeDecodeError)
+
+
+def _decode_line(raw: bytes) -> dict[str, Any]:
+    if _LINE_DECODER is None:
+        return json.loads(raw)
+    entry = _LINE_DECODER.decode(raw)
+    return {"stage": entry.stage, "payload": entry.payload, "ts_ns": entry.ts_ns, "ts": entry.ts}
+
+
+# Summary lines are written to stdout in batches rather than one print() each.
+_REPLAY_WRITE_BATCH = 4096
+
+
+def _preview_text(value: Any, limit: int = 120) -> str | None:
+    if value is None:
+        return None
+    text = str(value).strip()
+    if not text:
+        return None
+    # Newlines are only replaced inside the part that is actually shown.
+    suffix = ""
+    if len(text) > limit:
+        text, suffix = text[:limit], "..."
+    if "\n" in text:
+        text = text.replace("\n", " ")
+    return f"{text}{suffix}"
+
+
+def _format_ts(data: dict[str, Any]) -> str:
+    ts_ns = data.get("ts_ns")
+    if isinstance(ts_ns, int):
+        return datetime.fromtimestamp(ts_ns / 1_000_000_000, tz=timezone.utc).isoformat()
+    # traces written before ts_ns carry an ISO string
+    return str(data.get("ts", ""))
+
+
+def _summarize_plan(payload: dict[str, Any]) -> str:
+    steps = payload.get("steps_count")
+    candidate_ids = payload.get("candidate_ids_count") or payload.get("candidate_count")
+    parts = []
+    if steps is not None:
+        parts.append(f"steps={steps}")
+    if candidate_ids is not None:
+        parts.append(f"candidate_ids={candidate_ids}")
+    return " ".join(parts) if parts else "plan"
+
+
+def _summarize_examine(payload: dict[str, Any]) -> str:
+    events = payload.get("events_count")
+    glimpses = payload.get("glimpses_count")
+    parts = []
+    if events is not None:
+        parts.append(f"events={events}")
+    if glimpses is not None:
+        parts.append(f"glimpses={glimpses}")
+    return " ".join(parts) if parts else "examine"
+
+
+def _summarize_decision(payload: dict[str, Any]) -> str:
+    preview = _preview_text(payload.get("final_answer_preview"))
+    citations = payload.get("citations_count")
+    parts = []
+    if preview is not None:
+        parts.append(f"answer={preview}")
+    if citations is not None:
+        parts.append(f"citations={citations}")
+    return " ".join(parts) if parts else "decision"
+
+
+def _summarize_error(payload: dict[str, Any]) -> str:
+    error = payload.get("error")
+    return f"error={error}" if error is not None else "error"
+
+
+_STAGE_SUMMARIZERS = {
+    "plan": _summarize_plan,
+    "examine": _summarize_examine,
+    "decision": _summarize_decision,
+    "error": _summarize_error,
+}
+
+
+@lru_cache(maxsize=64)
+def _normalize_stage(stage: str) -> str:
+    # A trace repeats a handful of stage names; normalize each one once.
+    return stage.strip().lower()
+
+
+def _summarize_stage(stage: str, payload: Any) -> str:
+    if not isinstance(payload, dict):
+        return str(payload)
+    summarize = _STAGE_SUMMARIZERS.get(_normalize_stage(stage))
+    if summarize is None:
+        return f"keys={','.join(sorted(payload))}"
+    return summarize(payload)
+
+
+def _replay(trace_path: Path, *, count_only: bool = False) -> int:
+    if not trace_path.exists():
+        print(f"trace file not found: {trace_path}", file=sys.stderr)
+        return 1
+    write = sys.stdout.write
+    pending: list[str] = []
+    records = 0
+    with trace_path.open("rb") as handle:
+        for line_no, line in enumerate(handle, start=1):
+            raw = line.strip()
+            if not raw:
+                continue
+            try:
+                data = _decode_line(raw)
+            except _DECODE_ERRORS as exc:
+                # keep stdout ahead of the stderr diagnostic
+                if pending:
+                    write("".join(pending))
+                    pending.clear()
+                print(f"line {line_no} parse error: {exc}", file=sys.stderr)
+                continue
+            if count_only:
+                records += 1
+                continue
+            ts = _format_ts(data)
+            stage = data.get("stage", "")
+            payload = data.get("payload", {})
+            summary = _summarize_stage(stage, payload)
+            pending.append(f"{ts} {stage} {summary}\n")
+            if len(pending) >= _REPLAY_WRITE_BATCH:
+                write("".join(pending))
+                pending.clear()
+    if pending:
+        write("".join(pending))
+    if count_only:
+        write(f"records={records}\n")
+    return 0
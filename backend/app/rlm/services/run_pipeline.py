@@ -1,17 +1,26 @@
 from __future__ import annotations
 
+import asyncio
+import copy
+import hashlib
 import json
 import os
 import re
-from dataclasses import dataclass, field
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from functools import lru_cache, partial
 from typing import Any, Protocol
 
+import anyio
+
 from app.config import settings
 from app.rlm.adapters.inference_vllm import InferenceVllmAdapter, RetryPolicy
 from app.rlm.adapters.repos_sql import RlmRepoSQL
 from app.rlm.domain.models import CandidateIndex
 from app.rlm.services.retrieval import build_candidate_index
-from app.rlm.services.trace_logger import get_trace_logger
+from app.rlm.services.trace_logger import dropped_trace_entries, get_trace_logger
 
 try:
     from app.rlm.services.pipeline_executor import PipelineExecutor
@@ -21,6 +30,11 @@ except Exception as exc:  # noqa: BLE001 - optional import fallback
 else:
     _PIPELINE_EXECUTOR_IMPORT_ERROR = None
 
+try:
+    import msgspec
+except ImportError:  # optional fast JSON codec; stdlib json is the fallback
+    msgspec = None
+
 
 class RootLMClient(Protocol):
     def generate_program(
@@ -35,7 +49,9 @@ class RootLMClient(Protocol):
     def generate_final(
         self,
         index: CandidateIndex,
-        evidence: list[dict[str, Any]],
+        *,
+        events: list[dict[str, Any]],
+        glimpses: list[dict[str, Any]],
         subcalls: list[dict[str, Any]],
         options: dict[str, Any],
     ) -> "RootLMFinalResult":
@@ -52,21 +68,21 @@ class ProgramExecutor(Protocol):
         ...
 
 
-@dataclass
+@dataclass(slots=True)
 class RootLMProgramResult:
     program: dict[str, Any]
     meta: dict[str, Any] = field(default_factory=dict)
     raw: dict[str, Any] | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class RootLMFinalResult:
     final: dict[str, Any]
     meta: dict[str, Any] = field(default_factory=dict)
     raw: dict[str, Any] | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ExecutionResult:
     events: list[dict[str, Any]] = field(default_factory=list)
     glimpses: list[dict[str, Any]] = field(default_factory=list)
@@ -76,7 +92,7 @@ class ExecutionResult:
     meta: dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class RunResult:
     run_id: str
     status: str
@@ -96,7 +112,7 @@ class MockRootLM:
         limits: dict[str, Any],
         options: dict[str, Any],
     ) -> RootLMProgramResult:
-        candidate_ids = [candidate.artifact_id for candidate in index.candidates]
+        candidate_ids = index.candidate_ids
         program = options.get("program")
         if program is None:
             steps: list[dict[str, Any]] = []
@@ -109,7 +125,7 @@ class MockRootLM:
             program = {
                 "policy": policy,
                 "limits": limits,
-                "candidate_ids": candidate_ids,
+                "candidate_ids": list(candidate_ids),
                 "steps": steps,
             }
         meta = {
@@ -122,7 +138,9 @@ class MockRootLM:
     def generate_final(
         self,
         index: CandidateIndex,
-        evidence: list[dict[str, Any]],
+        *,
+        events: list[dict[str, Any]],
+        glimpses: list[dict[str, Any]],
         subcalls: list[dict[str, Any]],
         options: dict[str, Any],
     ) -> RootLMFinalResult:
@@ -131,29 +149,70 @@ class MockRootLM:
             answer = f"Mock answer for: {index.query}"
         final = {
             "answer": answer,
-            "citations": list(options.get("citations") or []),
-            "evidence_count": len(evidence),
+            "citations": options.get("citations") or [],
+            "evidence_count": len(events) + len(glimpses),
             "subcall_count": len(subcalls),
         }
         return RootLMFinalResult(final=final, meta={"mode": "mock"}, raw={"mock": True})
 
 
+# MockRootLM and MockExecutor keep no per-instance state, so one shared
+# instance of each serves every run. Give a path its own instance again if
+# either class ever grows fields.
+_MOCK_ROOTLM = MockRootLM()
+
+
+# A fenced block wins over any bare braces elsewhere in the reply.
 _JSON_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL | re.IGNORECASE)
+_JSON_OBJECT_RE = re.compile(r"\{.*\}", re.DOTALL)
+
+
+# Built once; reused for every prompt payload and model reply.
+_JSON_ENCODER = msgspec.json.Encoder() if msgspec is not None else None
+_JSON_DECODER = msgspec.json.Decoder() if msgspec is not None else None
+# msgspec.DecodeError does not subclass ValueError, so callers of _loads_json
+# catch both.
+_DECODE_ERRORS: tuple[type[Exception], ...] = (
+    (ValueError, msgspec.DecodeError) if msgspec is not None else (ValueError,)
+)
+
+
+def _dumps_payload(payload: dict[str, Any]) -> str:
+    if _JSON_ENCODER is not None:
+        return _JSON_ENCODER.encode(payload).decode("utf-8")
+    # Same compact form msgspec emits: fewer prompt tokens, identical cache keys.
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+
+
+def _loads_json(text: str) -> Any:
+    if _JSON_DECODER is not None:
+        return _JSON_DECODER.decode(text)
+    return json.loads(text)
 
 
 def _extract_json_payload(text: str) -> dict[str, Any] | None:
     cleaned = text.strip()
     if not cleaned:
         return None
+    if cleaned[0] == "{":
+        # Bare JSON is the common reply to "Return JSON only"; skip the regex scan.
+        try:
+            return _loads_json(cleaned)
+        except _DECODE_ERRORS:
+            pass
     match = _JSON_FENCE_RE.search(cleaned)
     if match:
         cleaned = match.group(1).strip()
     try:
-        return json.loads(cleaned)
-    except json.JSONDecodeError:
-        match = re.search(r"\{.*\}", cleaned, re.DOTALL)
-        if match:
-            return json.loads(match.group(0))
+        return _loads_json(cleaned)
+    except _DECODE_ERRORS:
+        pass
+    match = _JSON_OBJECT_RE.search(cleaned)
+    if match:
+        try:
+            return _loads_json(match.group(0))
+        except _DECODE_ERRORS:
+            pass
     return None
 
 
@@ -178,6 +237,19 @@ def _resolve_vllm_timeout(options: dict[str, Any]) -> float:
         return 20.0
 
 
+def _resolve_vllm_max_retries(options: dict[str, Any]) -> int:
+    raw = options.get("vllm_max_retries")
+    if raw is None:
+        raw = os.getenv("RLM_VLLM_MAX_RETRIES")
+    try:
+        value = int(raw)
+        if value < 0:
+            raise ValueError
+        return value
+    except Exception:
+        return 1
+
+
 def _resolve_plan_tokens(options: dict[str, Any]) -> int:
     raw = options.get("vllm_plan_max_tokens") or os.getenv("VLLM_PLAN_MAX_TOKENS")
     try:
@@ -221,17 +293,25 @@ def _truncate_evidence(evidence: list[dict[str, Any]], *, glimpse_limit: int = 4
     return truncated
 
 
-def _build_compact_decision_messages(query: str, evidence: list[dict[str, Any]]) -> list[dict[str, Any]]:
-    system_msg = "Reply in ONE line, <= 12 words. No explanations. Return JSON only."
+# Static prompt prefixes. Keep them byte-identical across requests (no
+# interpolation) so vLLM's automatic prefix caching can reuse their KV blocks.
+# The program prompt varies only in the JSON payload appended after "Input: ";
+# the decision call leads with the fixed system message.
+_PROGRAM_PREAMBLE = (
+    "You are RootLM. Return JSON only.\n"
+    "Schema: {\"program\": {\"steps\": [], \"candidate_ids\": [], \"policy\": {}, \"limits\": {}}}\n"
+    "Input: "
+)
+_DECISION_SYSTEM_MSG = "Reply in ONE line, <= 12 words. No explanations. Return JSON only."
+
+
+def _build_compact_decision_messages(query: str, glimpses: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    system_msg = _DECISION_SYSTEM_MSG
     question = (query or "").strip()
     question = question[:200]
     glimpse_text = ""
-    for item in evidence:
-        if "glimpses" in item and isinstance(item["glimpses"], list) and item["glimpses"]:
-            text = str(item["glimpses"][0].get("text") or "")
-            if text:
-                glimpse_text = text[:200]
-                break
+    if glimpses:
+        glimpse_text = str(glimpses[0].get("text") or "")[:200]
     messages = [
         {"role": "system", "content": system_msg},
         {"role": "user", "content": question or "Answer the question using evidence."},
@@ -248,6 +328,43 @@ def _build_compact_decision_messages(query: str, evidence: list[dict[str, Any]])
     return messages
 
 
+class _ResponseCache:
+    """
+    Thread-safe LRU of RootLM results keyed by a digest of the exact request.
+    Entries are deep-copied on put and on every hit, so callers may mutate
+    what they hand in or get back.
+    """
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        self._maxsize = maxsize
+        self._entries: OrderedDict[bytes, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: bytes) -> Any | None:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                return None
+            self._entries.move_to_end(key)
+        return copy.deepcopy(value)
+
+    def put(self, key: bytes, value: Any) -> None:
+        # Stored as a copy: the caller keeps (and may mutate) the original.
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_RESPONSE_CACHE = _ResponseCache(maxsize=1024)
+
+
 class VllmRootLM:
     def __init__(
         self,
@@ -259,6 +376,7 @@ class VllmRootLM:
         stop: list[str] | None = None,
         timeout_s: float = 20.0,
         max_tokens: int | None = None,
+        max_retries: int = 1,
     ) -> None:
         if not base_url:
             raise ValueError("VLLM_BASE_URL is required when RLM_ROOTLM_BACKEND=vllm")
@@ -271,13 +389,37 @@ class VllmRootLM:
             default_temperature=temperature,
             default_stop=stop or ["\n\n", "```", "<END>"],
             default_extra={"stream": False},
-            retry=RetryPolicy(timeout_s=timeout_s, max_retries=1, backoff_s=0.5),
+            retry=RetryPolicy(timeout_s=timeout_s, max_retries=max_retries, backoff_s=0.5),
         )
+        self._base_url = base_url
+        self._model = model
         self._timeout_s = timeout_s
         self._max_tokens = min(max_tokens or 128, 128)
         self._stop = stop or ["\n\n", "```", "<END>"]
         self._temperature = 0 if temperature is None else temperature
 
+    def _response_cache_key(
+        self,
+        kind: str,
+        messages: list[dict[str, Any]],
+        options: dict[str, Any],
+    ) -> bytes | None:
+        # Requests run at temperature 0, so identical inputs give identical
+        # outputs. Key only on what the adapter actually sends.
+        if not options.get("rlm_response_cache_enabled"):
+            return None
+        material = _dumps_payload(
+            {
+                "kind": kind,
+                "base_url": self._base_url,
+                "model": self._model,
+                "max_tokens": self._max_tokens,
+                "stop": self._stop,
+                "messages": messages,
+            }
+        )
+        return hashlib.blake2b(material.encode("utf-8"), digest_size=16).digest()
+
     def generate_program(
         self,
         index: CandidateIndex,
@@ -285,18 +427,18 @@ class VllmRootLM:
         limits: dict[str, Any],
         options: dict[str, Any],
     ) -> RootLMProgramResult:
-        candidate_ids = [candidate.artifact_id for candidate in index.candidates]
+        candidate_ids = index.candidate_ids
         payload = {
             "query": index.query,
             "policy": policy,
             "limits": limits,
             "candidate_ids": candidate_ids,
         }
-        prompt = (
-            "You are RootLM. Return JSON only.\n"
-            "Schema: {\"program\": {\"steps\": [], \"candidate_ids\": [], \"policy\": {}, \"limits\": {}}}\n"
-            f"Input: {json.dumps(payload, ensure_ascii=False)}"
-        )
+        prompt = _PROGRAM_PREAMBLE + _dumps_payload(payload)
+        cache_key = self._response_cache_key("program", [{"role": "user", "content": prompt}], options)
+        cached = _RESPONSE_CACHE.get(cache_key) if cache_key else None
+        if cached is not None:
+            return replace(cached, meta={**cached.meta, "cache_hit": True})
         raw_text = self._adapter.generate(
             prompt,
             timeout_s=self._timeout_s,
@@ -307,10 +449,10 @@ class VllmRootLM:
             program = {
                 "policy": policy,
                 "limits": limits,
-                "candidate_ids": candidate_ids,
+                "candidate_ids": list(candidate_ids),
                 "steps": [],
             }
-            return RootLMProgramResult(
+            result = RootLMProgramResult(
                 program=program,
                 meta={
                     "mode": "vllm",
@@ -320,38 +462,40 @@ class VllmRootLM:
                 },
                 raw={"text": raw_text},
             )
-        return RootLMProgramResult(
-            program=parsed.get("program") or parsed,
-            meta={
-                "mode": "vllm",
-                "parsed": True,
-                "timeout_s": self._timeout_s,
-                "max_tokens": self._max_tokens,
-            },
-            raw=parsed,
-        )
+        else:
+            result = RootLMProgramResult(
+                program=parsed.get("program") or parsed,
+                meta={
+                    "mode": "vllm",
+                    "parsed": True,
+                    "timeout_s": self._timeout_s,
+                    "max_tokens": self._max_tokens,
+                },
+                raw=parsed,
+            )
+        if cache_key and parsed is not None:
+            # Unparsed replies are not cached, so the next request retries.
+            _RESPONSE_CACHE.put(cache_key, result)
+        return result
 
     def generate_final(
         self,
         index: CandidateIndex,
-        evidence: list[dict[str, Any]],
+        *,
+        events: list[dict[str, Any]],
+        glimpses: list[dict[str, Any]],
         subcalls: list[dict[str, Any]],
         options: dict[str, Any],
     ) -> RootLMFinalResult:
-        payload = {
-            "query": index.query,
-            "evidence": evidence,
-            "subcalls": subcalls,
-        }
-        messages = _build_compact_decision_messages(index.query, evidence)
-        prompt = (
-            "You are RootLM. Reply in ONE line, <= 12 words. Do not add explanations.\n"
-            "Return JSON only.\n"
-            "Schema: {\"final\": {\"answer\": \"\", \"citations\": []}}\n"
-            f"Input: {json.dumps(payload, ensure_ascii=False)}"
-        )
+        # The adapter sends these messages in place of a prompt, so only the
+        # compact decision input is built; events and subcalls are not sent.
+        messages = _build_compact_decision_messages(index.query, glimpses)
+        cache_key = self._response_cache_key("final", messages, options)
+        cached = _RESPONSE_CACHE.get(cache_key) if cache_key else None
+        if cached is not None:
+            return replace(cached, meta={**cached.meta, "cache_hit": True})
         raw_text = self._adapter.generate(
-            prompt,
+            "",
             timeout_s=self._timeout_s,
             options={
                 "max_tokens": self._max_tokens,
@@ -363,7 +507,7 @@ class VllmRootLM:
         parsed = _extract_json_payload(raw_text)
         if parsed is None:
             final = {"answer": raw_text.strip(), "citations": []}
-            return RootLMFinalResult(
+            result = RootLMFinalResult(
                 final=final,
                 meta={
                     "mode": "vllm",
@@ -373,16 +517,21 @@ class VllmRootLM:
                 },
                 raw={"text": raw_text},
             )
-        return RootLMFinalResult(
-            final=parsed.get("final") or parsed,
-            meta={
-                "mode": "vllm",
-                "parsed": True,
-                "timeout_s": self._timeout_s,
-                "max_tokens": self._max_tokens,
-            },
-            raw=parsed,
-        )
+        else:
+            result = RootLMFinalResult(
+                final=parsed.get("final") or parsed,
+                meta={
+                    "mode": "vllm",
+                    "parsed": True,
+                    "timeout_s": self._timeout_s,
+                    "max_tokens": self._max_tokens,
+                },
+                raw=parsed,
+            )
+        if cache_key and parsed is not None:
+            # Unparsed replies are not cached, so the next request retries.
+            _RESPONSE_CACHE.put(cache_key, result)
+        return result
 
 
 class MockExecutor:
@@ -393,15 +542,20 @@ class MockExecutor:
         options: dict[str, Any],
     ) -> ExecutionResult:
         return ExecutionResult(
-            events=list(options.get("events") or []),
-            glimpses=list(options.get("glimpses") or []),
-            subcalls=list(options.get("subcalls") or []),
-            variables=dict(options.get("vars") or {}),
+            # Shared with options, not copied: run_rlm only reads these lists and
+            # returns them as-is in RunResult.
+            events=options.get("events") or [],
+            glimpses=options.get("glimpses") or [],
+            subcalls=options.get("subcalls") or [],
+            variables=options.get("vars") or {},
             status=str(options.get("executor_status") or "ok"),
             meta={"mode": "mock", "program_summary": program.get("steps")},
         )
 
 
+_MOCK_EXECUTOR = MockExecutor()
+
+
 def _select_executor(
     executor: ProgramExecutor | None,
     *,
@@ -415,7 +569,7 @@ def _select_executor(
     backend = str(options.get("executor_backend") or "real").strip().lower()
     if backend == "mock":
         meta["executor_backend"] = "mock"
-        return MockExecutor()
+        return _MOCK_EXECUTOR
     if PipelineExecutor is None:
         errors.append(
             {
@@ -424,7 +578,7 @@ def _select_executor(
             }
         )
         meta["executor_backend"] = "mock_fallback"
-        return MockExecutor()
+        return _MOCK_EXECUTOR
     meta["executor_backend"] = "real"
     return PipelineExecutor(repo=repo)
 
@@ -432,49 +586,46 @@ def _select_executor(
 def _normalize_execution(
     execution: Any,
 ) -> tuple[list[dict[str, Any]], list[dict[str, Any]], list[dict[str, Any]], dict[str, Any], str, dict[str, Any]]:
-    normalized = False
-
-    def _as_list(value: Any) -> list[dict[str, Any]]:
-        nonlocal normalized
-        if isinstance(value, list):
-            return value
-        if value is None:
-            normalized = True
-            return []
-        normalized = True
-        return []
-
-    def _as_dict(value: Any) -> dict[str, Any]:
-        nonlocal normalized
-        if isinstance(value, dict):
-            return dict(value)
-        if value is None:
-            normalized = True
-            return {}
-        normalized = True
-        return {}
-
     if isinstance(execution, dict):
-        events = _as_list(execution.get("events"))
-        glimpses = _as_list(execution.get("glimpses"))
-        subcalls = _as_list(execution.get("subcalls"))
-        variables = _as_dict(execution.get("variables"))
+        events = execution.get("events")
+        glimpses = execution.get("glimpses")
+        subcalls = execution.get("subcalls")
+        variables = execution.get("variables")
         status = execution.get("status")
-        meta = _as_dict(execution.get("meta"))
+        meta = execution.get("meta")
     else:
-        events = _as_list(getattr(execution, "events", None))
-        glimpses = _as_list(getattr(execution, "glimpses", None))
-        subcalls = _as_list(getattr(execution, "subcalls", None))
-        variables = _as_dict(getattr(execution, "variables", None))
+        events = getattr(execution, "events", None)
+        glimpses = getattr(execution, "glimpses", None)
+        subcalls = getattr(execution, "subcalls", None)
+        variables = getattr(execution, "variables", None)
         status = getattr(execution, "status", None)
-        meta = _as_dict(getattr(execution, "meta", None))
-
+        meta = getattr(execution, "meta", None)
+
+    normalized = not (
+        isinstance(events, list)
+        and isinstance(glimpses, list)
+        and isinstance(subcalls, list)
+        and isinstance(variables, dict)
+        and isinstance(meta, dict)
+        and isinstance(status, str)
+        and status
+    )
+    if not isinstance(events, list):
+        events = []
+    if not isinstance(glimpses, list):
+        glimpses = []
+    if not isinstance(subcalls, list):
+        subcalls = []
+    if not isinstance(variables, dict):
+        variables = {}
+    if not isinstance(meta, dict):
+        meta = {}
     if not isinstance(status, str) or not status:
         status = "ok"
-        normalized = True
 
     if normalized:
-        meta["normalized"] = True
+        # Copy only here: the executor's own meta dict is left untouched.
+        meta = {**meta, "normalized": True}
 
     return events, glimpses, subcalls, variables, status, meta
 
@@ -494,7 +645,10 @@ def _build_evidence(
 def _preview_text(text: str | None, limit: int = 120) -> str | None:
     if text is None:
         return None
-    cleaned = str(text).replace("\n", " ").strip()
+    cleaned = str(text)
+    if "\n" in cleaned:
+        cleaned = cleaned.replace("\n", " ")
+    cleaned = cleaned.strip()
     if not cleaned:
         return None
     if len(cleaned) > limit:
@@ -554,20 +708,42 @@ def _summarize_decision_trace(
     return payload
 
 
+@lru_cache(maxsize=16)
+def _get_vllm_rootlm(
+    base_url: str,
+    api_key: str | None,
+    model: str | None,
+    max_tokens: int | None,
+    temperature: float | None,
+    timeout_s: float = 20.0,
+    max_retries: int = 1,
+) -> VllmRootLM:
+    # One client per resolved config, shared by every run in the process.
+    return VllmRootLM(
+        base_url=base_url,
+        api_key=api_key,
+        model=model,
+        max_tokens=max_tokens,
+        temperature=temperature,
+        timeout_s=timeout_s,
+        max_retries=max_retries,
+    )
+
+
 def _select_rootlm(options: dict[str, Any]) -> RootLMClient:
     backend = str(options.get("rootlm_backend") or settings.rlm_rootlm_backend or "mock")
     backend = backend.strip().lower()
     if backend == "vllm":
         config = _resolve_vllm_config(options)
-        return VllmRootLM(
-            base_url=config["base_url"],
-            api_key=config["api_key"],
-            model=config["model"],
-            max_tokens=config["max_tokens"],
-            temperature=config["temperature"],
+        return _get_vllm_rootlm(
+            config["base_url"],
+            config["api_key"],
+            config["model"],
+            config["max_tokens"],
+            config["temperature"],
         )
     if backend in {"mock", ""}:
-        return MockRootLM()
+        return _MOCK_ROOTLM
     raise ValueError(f"unsupported rootlm backend: {backend}")
 
 
@@ -579,7 +755,7 @@ def _normalize_vllm_base_url(value: str) -> str:
 
 
 def _resolve_decision_vllm_config(options: dict[str, Any]) -> tuple[dict[str, Any] | None, str | None]:
-    config = dict(_resolve_vllm_config(options))
+    config = _resolve_vllm_config(options)
     missing: list[str] = []
     base_url = config.get("base_url")
     if base_url:
@@ -605,41 +781,45 @@ def run_rlm(
 ) -> RunResult:
     options = options or {}
     # NOTE: Decision stage can use vLLM; plan remains mock until a later milestone.
-    plan_rootlm = rootlm or MockRootLM()
-    decision_backend = str(options.get("rootlm_backend") or settings.rlm_rootlm_backend or "mock")
-    decision_backend = decision_backend.strip().lower()
-    decision_rootlm: RootLMClient = MockRootLM()
+    plan_rootlm = rootlm or _MOCK_ROOTLM
+    decision_rootlm: RootLMClient = _MOCK_ROOTLM
     decision_mode = "mock"
     decision_fallback_reason: str | None = None
-    decision_timeout = _resolve_vllm_timeout(options)
-    decision_tokens = _resolve_decision_tokens(options)
-    if decision_backend == "vllm":
-        config, decision_fallback_reason = _resolve_decision_vllm_config(options)
-        if config:
-            try:
-                decision_rootlm = VllmRootLM(
-                    base_url=config["base_url"],
-                    api_key=config["api_key"],
-                    model=config["model"],
-                    max_tokens=decision_tokens,
-                    temperature=0,
-                    stop=["\n\n", "```", "<END>"],
-                    timeout_s=decision_timeout,
-                )
-                decision_mode = "vllm"
-            except Exception as exc:
-                decision_fallback_reason = f"vllm_init_failed: {exc.__class__.__name__}: {exc}"
-                decision_rootlm = MockRootLM()
-                decision_mode = "mock"
+    if rootlm is not None:
+        # The caller already chose the backend; use it for decision too.
+        decision_rootlm = rootlm
+        decision_mode = str(getattr(rootlm, "mode", "injected"))
+    else:
+        decision_backend = str(options.get("rootlm_backend") or settings.rlm_rootlm_backend or "mock")
+        if decision_backend.strip().lower() == "vllm":
+            config, decision_fallback_reason = _resolve_decision_vllm_config(options)
+            if config:
+                try:
+                    decision_rootlm = _get_vllm_rootlm(
+                        config["base_url"],
+                        config["api_key"],
+                        config["model"],
+                        _resolve_decision_tokens(options),
+                        0,
+                        _resolve_vllm_timeout(options),
+                        _resolve_vllm_max_retries(options),
+                    )
+                    decision_mode = "vllm"
+                except Exception as exc:
+                    decision_fallback_reason = f"vllm_init_failed: {exc.__class__.__name__}: {exc}"
+                    decision_rootlm = _MOCK_ROOTLM
+                    decision_mode = "mock"
 
     index = build_candidate_index(repo, session_id, query, options)
     run_id = repo.insert_run(
         session_id=session_id,
         query=query,
         options=options,
-        candidate_index=index.model_dump(),
+        candidate_index=index.dump,
     )
-    trace_logger = get_trace_logger(run_id)
+    # Traces are on disk when run_rlm returns unless the caller opts into the
+    # background writer, which may lag (or drop lines when its queue is full).
+    trace_logger = get_trace_logger(run_id, background=bool(options.get("rlm_trace_background")))
 
     status = "ok"
     errors: list[dict[str, Any]] = []
@@ -663,12 +843,33 @@ def run_rlm(
     final: dict[str, Any] = {}
     final_answer: str | None = None
     citations: list[Any] = []
-    evidence: list[dict[str, Any]] = _build_evidence(events, glimpses, subcalls)
+    evidence: list[dict[str, Any]] = []
+    # Columns touched by each stage accumulate here and reach the DB in one
+    # UPDATE when the run returns (happy path or early error exit). Every
+    # column starts out empty, so an early exit still writes the full row
+    # shape. The cost: until that UPDATE the row shows none of the run's
+    # intermediate state, and a run that crashes or is killed mid-pipeline
+    # leaves no plan, examine or decision output in the DB (the trace file
+    # still records each finished stage).
+    run_patch: dict[str, Any] = {
+        "program": program,
+        "meta": meta,
+        "events": events,
+        "glimpses": glimpses,
+        "glimpses_meta": glimpses_meta,
+        "subcalls": subcalls,
+        "evidence": evidence,
+        "final": final,
+        "final_answer": final_answer,
+        "citations": citations,
+        "status": status,
+        "errors": errors,
+    }
 
     plan_error: dict[str, Any] | None = None
     try:
-        policy = dict(options.get("policy") or {})
-        limits = dict(options.get("limits") or {})
+        policy = options.get("policy") or {}
+        limits = options.get("limits") or {}
         program_result = plan_rootlm.generate_program(index, policy, limits, options)
         program = program_result.program
         meta["round1"] = {
@@ -682,21 +883,7 @@ def run_rlm(
         errors.append({"stage": "round1", "error": str(exc)})
         plan_error = {"stage": "round1", "error": str(exc)}
 
-    repo.update_run_payload(
-        run_id,
-        program=program,
-        meta=meta,
-        events=events,
-        glimpses=glimpses,
-        glimpses_meta=glimpses_meta,
-        subcalls=subcalls,
-        evidence=evidence,
-        final=final,
-        final_answer=final_answer,
-        citations=citations,
-        status=status,
-        errors=errors,
-    )
+    run_patch.update(program=program, meta=meta, status=status, errors=errors)
     trace_logger.append(
         stage="plan",
         payload=_summarize_plan_trace(program, len(index.candidates)),
@@ -710,6 +897,7 @@ def run_rlm(
         )
 
     if status != "ok":
+        repo.update_run_payload(run_id, **run_patch)
         return RunResult(
             run_id=run_id,
             status=status,
@@ -726,17 +914,19 @@ def run_rlm(
     try:
         execution = executor.execute(program, index, options)
         events, glimpses, subcalls, variables, exec_status, exec_meta = _normalize_execution(execution)
-        glimpses_meta = list(options.get("glimpses_meta") or [])
-        if not glimpses_meta:
+        provided_meta = options.get("glimpses_meta")
+        if provided_meta:
+            glimpses_meta = list(provided_meta)
+        else:
             glimpses_meta = [
-                item.get("glimpse_meta")
+                glimpse_meta
                 for item in glimpses
-                if isinstance(item, dict) and item.get("glimpse_meta")
+                if isinstance(item, dict) and (glimpse_meta := item.get("glimpse_meta"))
             ]
         evidence = _build_evidence(events, glimpses, subcalls)
         meta["round2"] = {
             **exec_meta,
-            "vars": dict(variables),
+            "vars": variables,
             "status": exec_status,
             "stage": "examine",
         }
@@ -746,18 +936,13 @@ def run_rlm(
         errors.append({"stage": "round2", "error": str(exc)})
         examine_error = {"stage": "round2", "error": str(exc)}
 
-    repo.update_run_payload(
-        run_id,
-        program=program,
+    run_patch.update(
         meta=meta,
         events=events,
         glimpses=glimpses,
         glimpses_meta=glimpses_meta,
         subcalls=subcalls,
         evidence=evidence,
-        final=final,
-        final_answer=final_answer,
-        citations=citations,
         status=status,
         errors=errors,
     )
@@ -774,6 +959,7 @@ def run_rlm(
         )
 
     if status != "ok":
+        repo.update_run_payload(run_id, **run_patch)
         return RunResult(
             run_id=run_id,
             status=status,
@@ -790,17 +976,23 @@ def run_rlm(
     if decision_fallback_reason:
         decision_trace_meta["fallback_reason"] = decision_fallback_reason
     try:
-        evidence = _build_evidence(events, glimpses, subcalls)
         final_result: RootLMFinalResult | None = None
-        if decision_mode == "vllm":
+        fallback_from = "vllm"
+        if decision_rootlm is not _MOCK_ROOTLM:
+            # vLLM and injected root LMs alike fall back to the mock decision.
             try:
-                final_result = decision_rootlm.generate_final(index, evidence, subcalls, options)
+                final_result = decision_rootlm.generate_final(
+                    index, events=events, glimpses=glimpses, subcalls=subcalls, options=options
+                )
             except Exception as exc:
-                decision_fallback_reason = f"vllm_request_failed: {exc.__class__.__name__}: {exc}"
+                fallback_from = decision_mode
+                decision_fallback_reason = f"{decision_mode}_request_failed: {exc.__class__.__name__}: {exc}"
                 decision_mode = "mock"
-                decision_rootlm = MockRootLM()
+                decision_rootlm = _MOCK_ROOTLM
         if final_result is None:
-            final_result = decision_rootlm.generate_final(index, evidence, subcalls, options)
+            final_result = decision_rootlm.generate_final(
+                index, events=events, glimpses=glimpses, subcalls=subcalls, options=options
+            )
         final = final_result.final
         final_answer = str(final.get("answer")) if final.get("answer") is not None else None
         citations = list(final.get("citations") or [])
@@ -811,7 +1003,7 @@ def run_rlm(
         }
         if decision_fallback_reason:
             round3_meta["fallback_reason"] = decision_fallback_reason
-            round3_meta["fallback_from"] = "vllm"
+            round3_meta["fallback_from"] = fallback_from
         meta["round3"] = round3_meta
         decision_trace_meta = {"status": status, "mode": round3_meta.get("mode")}
         if decision_fallback_reason:
@@ -821,21 +1013,19 @@ def run_rlm(
         errors.append({"stage": "round3", "error": str(exc)})
         decision_error = {"stage": "round3", "error": str(exc)}
 
-    repo.update_run_payload(
-        run_id,
-        program=program,
+    run_patch.update(
         meta=meta,
-        events=events,
-        glimpses=glimpses,
-        glimpses_meta=glimpses_meta,
-        subcalls=subcalls,
-        evidence=evidence,
         final=final,
         final_answer=final_answer,
         citations=citations,
         status=status,
         errors=errors,
     )
+    repo.update_run_payload(run_id, **run_patch)
+    trace_dropped = dropped_trace_entries()
+    if trace_dropped:
+        # Process-wide count, so a gap in any earlier run's trace shows up here.
+        decision_trace_meta["trace_dropped_total"] = trace_dropped
     trace_logger.append(
         stage="decision",
         payload=_summarize_decision_trace(final_answer, citations, final),
@@ -858,3 +1048,85 @@ def run_rlm(
         final_answer=final_answer,
         citations=citations,
     )
+
+
+# Shared default for run_rlm_batch and arun_rlm_batch.
+_BATCH_MAX_CONCURRENCY = 8
+
+
+def run_rlm_batch(
+    repo: RlmRepoSQL,
+    items: list[tuple[str, str, dict[str, Any] | None]],
+    *,
+    max_concurrency: int = _BATCH_MAX_CONCURRENCY,
+) -> list[RunResult]:
+    """
+    Run several (session_id, query, options) requests concurrently.
+
+    The pipeline is blocking, so each run gets a worker thread; their vLLM
+    requests are in flight together and the server batches them continuously.
+    Results are returned in input order.
+    """
+    if not items:
+        return []
+    workers = max(1, min(int(max_concurrency), len(items)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="rlm-batch") as pool:
+        futures = [
+            pool.submit(run_rlm, repo, session_id, query, options)
+            for session_id, query, options in items
+        ]
+        return [future.result() for future in futures]
+
+
+async def arun_rlm(
+    repo: RlmRepoSQL,
+    session_id: str,
+    query: str,
+    options: dict[str, Any] | None = None,
+    *,
+    rootlm: RootLMClient | None = None,
+    executor: ProgramExecutor | None = None,
+) -> RunResult:
+    """
+    Async entry point for run_rlm.
+
+    Every stage depends on the previous one (plan needs the candidate index,
+    which is also what insert_run persists), so the run itself stays
+    sequential. It runs on AnyIO's worker threads, the same capacity-limited
+    pool Starlette uses for sync endpoints, so the event loop stays free
+    without shrinking the server's concurrency to asyncio's default executor.
+    """
+    return await anyio.to_thread.run_sync(
+        partial(
+            run_rlm,
+            repo,
+            session_id,
+            query,
+            options,
+            rootlm=rootlm,
+            executor=executor,
+        )
+    )
+
+
+async def arun_rlm_batch(
+    repo: RlmRepoSQL,
+    items: list[tuple[str, str, dict[str, Any] | None]],
+    *,
+    max_concurrency: int = _BATCH_MAX_CONCURRENCY,
+) -> list[RunResult]:
+    """
+    Async counterpart of run_rlm_batch: at most max_concurrency runs are in
+    flight at once, and results come back in input order.
+    """
+    if not items:
+        return []
+    semaphore = asyncio.Semaphore(max(1, int(max_concurrency)))
+
+    async def _limited(session_id: str, query: str, options: dict[str, Any] | None) -> RunResult:
+        async with semaphore:
+            return await arun_rlm(repo, session_id, query, options)
+
+    return list(
+        await asyncio.gather(*(_limited(session_id, query, options) for session_id, query, options in items))
+    )
@@ -1,34 +1,53 @@
 from __future__ import annotations
 
+import atexit
 import json
+import logging
 import os
+import queue
+import threading
+import time
 from dataclasses import asdict, is_dataclass
-from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, TextIO
+
+try:
+    import msgspec
+except ImportError:  # optional fast JSON codec; stdlib json is the fallback
+    msgspec = None
+
+logger = logging.getLogger(__name__)
 
 _DEFAULT_TRACE_DIR = Path(__file__).resolve().parents[3] / "var" / "rlm_traces"
 
+# Buffer for the background writer's handles only; lines reach the file when
+# the queue drains (or the buffer fills). The synchronous path flushes per line.
+_WRITE_BUFFER_BYTES = 64 * 1024
+
 
-def _jsonable(obj: Any) -> Any:
-    if obj is None:
-        return None
-    if isinstance(obj, (str, int, float, bool)):
-        return obj
-    if isinstance(obj, dict):
-        return {str(k): _jsonable(v) for k, v in obj.items()}
-    if isinstance(obj, (list, tuple)):
-        return [_jsonable(item) for item in obj]
-    if is_dataclass(obj):
-        return _jsonable(asdict(obj))
+def _coerce_unknown(obj: Any) -> Any:
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return asdict(obj)
     if hasattr(obj, "model_dump") and callable(getattr(obj, "model_dump")):
         try:
-            return _jsonable(obj.model_dump())
+            return obj.model_dump()
         except Exception:
             return str(obj)
     return str(obj)
 
 
+# Encodes dicts, lists, dataclasses and datetimes natively; the hook only sees
+# the leftovers, so entries no longer need a sanitising pre-walk.
+_ENTRY_ENCODER = msgspec.json.Encoder(enc_hook=_coerce_unknown) if msgspec is not None else None
+
+
+def _dumps_entry(entry: dict[str, Any]) -> str:
+    if _ENTRY_ENCODER is not None:
+        return _ENTRY_ENCODER.encode(entry).decode("utf-8")
+    return json.dumps(entry, ensure_ascii=False, separators=(",", ":"), default=_coerce_unknown)
+
+
 def _resolve_trace_dir(trace_dir: str | Path | None = None) -> Path:
     if trace_dir:
         return Path(trace_dir).expanduser()
@@ -38,44 +57,147 @@ def _resolve_trace_dir(trace_dir: str | Path | None = None) -> Path:
     return _DEFAULT_TRACE_DIR
 
 
+@lru_cache(maxsize=64)
+def _ensure_trace_dir(trace_dir: Path) -> Path:
+    # mkdir once per directory per process, not once per run
+    trace_dir.mkdir(parents=True, exist_ok=True)
+    return trace_dir
+
+
 class TraceLogger:
     def __init__(self, run_id: str, trace_dir: str | Path | None = None) -> None:
         self._run_id = str(run_id)
-        self._trace_dir = _resolve_trace_dir(trace_dir)
-        self._trace_dir.mkdir(parents=True, exist_ok=True)
+        self._trace_dir = _ensure_trace_dir(_resolve_trace_dir(trace_dir))
         self._path = self._trace_dir / f"{self._run_id}.jsonl"
+        # Wall clock sampled once per logger; per-line timestamps are this plus
+        # monotonic elapsed time, written as integer ns (readers format them).
+        self._wall_base_ns = time.time_ns()
+        self._mono_base_ns = time.monotonic_ns()
 
     @property
     def path(self) -> Path:
         return self._path
 
     def append(self, *, stage: str, payload: dict, meta: dict | None = None) -> None:
-        entry = {
-            "ts": datetime.now(timezone.utc).isoformat(),
-            "run_id": self._run_id,
-            "stage": str(stage),
-            "payload": _jsonable(payload),
-            "meta": _jsonable(meta or {}),
-        }
-        self._write_line(entry)
+        self._write_line(self._build_entry(stage, payload, meta))
 
     def append_error(self, *, stage: str, error: str, meta: dict | None = None) -> None:
-        payload = {"error": str(error)}
-        entry = {
-            "ts": datetime.now(timezone.utc).isoformat(),
+        self._write_line(self._build_entry(stage, {"error": str(error)}, meta))
+
+    def _build_entry(self, stage: str, payload: dict, meta: dict | None) -> dict[str, Any]:
+        return {
+            "ts_ns": self._wall_base_ns + (time.monotonic_ns() - self._mono_base_ns),
             "run_id": self._run_id,
             "stage": str(stage),
-            "payload": _jsonable(payload),
-            "meta": _jsonable(meta or {}),
+            "payload": payload,
+            "meta": meta or {},
         }
-        self._write_line(entry)
 
     def _write_line(self, entry: dict[str, Any]) -> None:
-        line = json.dumps(entry, ensure_ascii=False, separators=(",", ":"))
+        line = _dumps_entry(entry)
         with self._path.open("a", encoding="utf-8") as handle:
             handle.write(line + "\n")
             handle.flush()
 
 
-def get_trace_logger(run_id: str, trace_dir: str | Path | None = None) -> TraceLogger:
-    return TraceLogger(run_id, trace_dir=trace_dir)
+_QUEUE_MAXSIZE = 10_000
+_write_queue: queue.Queue[tuple[Path, str]] = queue.Queue(maxsize=_QUEUE_MAXSIZE)
+_writer_lock = threading.Lock()
+_writer_thread: threading.Thread | None = None
+_dropped_entries = 0
+
+
+def _drain_write_queue() -> None:
+    # Only this thread keeps trace files open: handles stay open across a
+    # burst and are closed once the queue is caught up, so finished runs hold
+    # neither descriptors nor unflushed lines.
+    handles: dict[Path, TextIO] = {}
+    while True:
+        path, line = _write_queue.get()
+        try:
+            handle = handles.get(path)
+            if handle is None:
+                handle = path.open("a", encoding="utf-8", buffering=_WRITE_BUFFER_BYTES)
+                handles[path] = handle
+            handle.write(line)
+        except Exception:  # noqa: BLE001 - a bad trace line must not stop the writer
+            logger.exception("trace write failed for %s", path)
+        finally:
+            if _write_queue.empty():
+                for handle in handles.values():
+                    try:
+                        handle.close()
+                    except Exception:  # noqa: BLE001
+                        logger.exception("trace flush failed for %s", handle.name)
+                handles.clear()
+            _write_queue.task_done()
+
+
+def _ensure_writer_thread() -> None:
+    global _writer_thread
+    if _writer_thread is not None:
+        return
+    with _writer_lock:
+        if _writer_thread is None:
+            thread = threading.Thread(target=_drain_write_queue, name="rlm-trace-writer", daemon=True)
+            thread.start()
+            _writer_thread = thread
+            # The writer is a daemon thread; drain it before the interpreter
+            # exits so short-lived scripts keep their last trace lines.
+            atexit.register(flush_trace_queue)
+
+
+def flush_trace_queue() -> None:
+    """Block until every queued trace entry has been written."""
+    _write_queue.join()
+
+
+def dropped_trace_entries() -> int:
+    """Number of trace entries discarded because the write queue was full."""
+    return _dropped_entries
+
+
+class QueuingTraceLogger:
+    """
+    TraceLogger front-end that builds and encodes entries on the caller's
+    thread and hands only the file write to a single background writer, so
+    callers may mutate payloads after append. When the queue is full the
+    entry is dropped, logged and counted rather than blocking the run.
+    """
+
+    def __init__(self, logger: TraceLogger) -> None:
+        self._logger = logger
+        _ensure_writer_thread()
+
+    @property
+    def path(self) -> Path:
+        return self._logger.path
+
+    def append(self, *, stage: str, payload: dict, meta: dict | None = None) -> None:
+        self._enqueue(self._logger._build_entry(stage, payload, meta))
+
+    def append_error(self, *, stage: str, error: str, meta: dict | None = None) -> None:
+        self._enqueue(self._logger._build_entry(stage, {"error": str(error)}, meta))
+
+    def _enqueue(self, entry: dict[str, Any]) -> None:
+        global _dropped_entries
+        try:
+            _write_queue.put_nowait((self._logger.path, _dumps_entry(entry) + "\n"))
+        except queue.Full:
+            with _writer_lock:
+                _dropped_entries += 1
+                dropped = _dropped_entries
+            if dropped == 1 or dropped % 1000 == 0:
+                logger.warning("trace queue full; %d entries dropped so far", dropped)
+
+
+def get_trace_logger(
+    run_id: str,
+    trace_dir: str | Path | None = None,
+    *,
+    background: bool = False,
+) -> TraceLogger | QueuingTraceLogger:
+    logger = TraceLogger(run_id, trace_dir=trace_dir)
+    if background:
+        return QueuingTraceLogger(logger)
+    return logger
@@ -19,6 +19,9 @@ class StubRlmRunService:
     def run(self, session_id: str, query: str, options: dict[str, object]) -> dict[str, object]:
         return self.payload
 
+    async def arun(self, session_id: str, query: str, options: dict[str, object]) -> dict[str, object]:
+        return self.payload
+
 
 class StubRlmAssembleService:
     def __init__(self, payload: dict[str, object]):
@@ -37,6 +40,9 @@ class StubRlmErrorService:
     def run(self, session_id: str, query: str, options: dict[str, object]) -> dict[str, object]:
         raise self.error
 
+    async def arun(self, session_id: str, query: str, options: dict[str, object]) -> dict[str, object]:
+        raise self.error
+
     def assemble(
         self, session_id: str, query: str, options: dict[str, object]
     ) -> dict[str, object]:
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from app.rlm.domain.models import Candidate, CandidateIndex
+
+# Built once at import; list_candidates hands out shallow copies.
+_CANDIDATE_INDEX_TEMPLATE = CandidateIndex(
+    session_id="",
+    project_id="p1",
+    query="",
+    candidates=[
+        Candidate(
+            artifact_id="a1",
+            scope="session",
+            type="note",
+            title="t1",
+            content_hash="hash-a1",
+            content_preview="preview",
+            base_score=1.0,
+        )
+    ],
+)
+
+
+class FakeRepo:
+    def __init__(self) -> None:
+        self.payloads: list[dict[str, Any]] = []
+
+    def list_candidates(self, session_id: str, query: str, tokens: list[str], opt: Any) -> CandidateIndex:
+        return _CANDIDATE_INDEX_TEMPLATE.model_copy(update={"session_id": session_id, "query": query})
+
+    def insert_run(
+        self,
+        session_id: str,
+        query: str,
+        options: dict | None = None,
+        candidate_index: dict | None = None,
+    ) -> str:
+        return "run-1"
+
+    def update_run_payload(self, run_id: str, **fields: Any) -> None:
+        self.payloads.append({"run_id": run_id, **fields})
+
+    def get_artifact_text(self, artifact_id: str) -> str | None:
+        if artifact_id == "a1":
+            return "Full content for artifact a1."
+        return None
+
+    def get_artifact_metadata(self, artifact_id: str) -> dict[str, Any]:
+        if artifact_id == "a1":
+            return {"content_hash": "hash-a1"}
+        return {}
+
+
+@pytest.fixture
+def fake_repo() -> FakeRepo:
+    return FakeRepo()
+
+
+@pytest.fixture(autouse=True)
+def _trace_dir(monkeypatch, tmp_path) -> None:
+    monkeypatch.setenv("RLM_TRACE_DIR", str(tmp_path))
@@ -1,100 +1,118 @@
 from __future__ import annotations
 
-from typing import Any
-
-from app.rlm.domain.models import Candidate, CandidateIndex
-from app.rlm.services.run_pipeline import run_rlm
-
-
-class _FakeRepo:
-    def __init__(self) -> None:
-        self.payloads: list[dict[str, Any]] = []
-
-    def list_candidates(self, session_id: str, query: str, tokens: list[str], opt: Any) -> CandidateIndex:
-        candidate = Candidate(
-            artifact_id="a1",
-            scope="session",
-            type="note",
-            title="t1",
-            content_hash="hash-a1",
-            content_preview="preview",
-            base_score=1.0,
-        )
-        return CandidateIndex(
-            session_id=session_id,
-            project_id="p1",
-            query=query,
-            candidates=[candidate],
-        )
-
-    def insert_run(
-        self,
-        session_id: str,
-        query: str,
-        options: dict | None = None,
-        candidate_index: dict | None = None,
-    ) -> str:
-        return "run-1"
-
-    def update_run_payload(
-        self,
-        run_id: str,
-        *,
-        program: dict,
-        meta: dict,
-        events: list[dict],
-        glimpses: list[dict],
-        glimpses_meta: list[dict],
-        subcalls: list[dict],
-        evidence: list[dict],
-        final: dict,
-        final_answer: str | None,
-        citations: list[Any],
-        status: str,
-        errors: list[dict] | dict | None = None,
-    ) -> None:
-        self.payloads.append(
-            {
-                "run_id": run_id,
-                "status": status,
-                "final_answer": final_answer,
-                "events": events,
-                "glimpses": glimpses,
-                "meta": meta,
-            }
-        )
-
-    def get_artifact_text(self, artifact_id: str) -> str | None:
-        if artifact_id == "a1":
-            return "Full content for artifact a1."
-        return None
-
-    def get_artifact_metadata(self, artifact_id: str) -> dict[str, Any]:
-        if artifact_id == "a1":
-            return {"content_hash": "hash-a1"}
-        return {}
-
-
-def test_run_rlm_with_real_executor(monkeypatch, tmp_path) -> None:
-    monkeypatch.setenv("RLM_TRACE_DIR", str(tmp_path))
-    repo = _FakeRepo()
-    result = run_rlm(repo, "s1", "what is this?", {"executor_backend": "real"})
+import asyncio
+import pytest
+
+from app.rlm.domain.models import CandidateIndex
+from app.rlm.services.run_pipeline import (
+    MockRootLM,
+    VllmRootLM,
+    _extract_json_payload,
+    _get_vllm_rootlm,
+    arun_rlm,
+    arun_rlm_batch,
+    run_rlm,
+    run_rlm_batch,
+)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_vllm_clients():
+    # Cached clients would outlive monkeypatched adapters between tests.
+    _get_vllm_rootlm.cache_clear()
+    yield
+    _get_vllm_rootlm.cache_clear()
+
+
+def test_run_rlm_with_real_executor(fake_repo) -> None:
+    result = run_rlm(fake_repo, "s1", "what is this?", {"executor_backend": "real"})
 
     assert result.status == "ok"
     assert result.final_answer
     assert result.glimpses
+    (write,) = fake_repo.payloads
+    assert write["program"] and write["glimpses"] and write["final_answer"]
+    assert write["status"] == "ok"
+
+
+def test_run_rlm_batch_preserves_order(fake_repo) -> None:
+    items = [("s1", f"question {i}?", {"executor_backend": "real"}) for i in range(3)]
+    results = run_rlm_batch(fake_repo, items, max_concurrency=2)
+
+    assert [r.status for r in results] == ["ok", "ok", "ok"]
+    assert [r.final_answer for r in results] == [f"Mock answer for: question {i}?" for i in range(3)]
+
+
+def test_arun_rlm_matches_sync(fake_repo) -> None:
+    result = asyncio.run(arun_rlm(fake_repo, "s1", "what is this?", {"executor_backend": "real"}))
+
+    assert result.status == "ok"
+    assert result.final_answer == "Mock answer for: what is this?"
+
+
+def test_arun_rlm_batch_preserves_order(fake_repo) -> None:
+    items = [("s1", f"question {i}?", {"executor_backend": "real"}) for i in range(3)]
+    results = asyncio.run(arun_rlm_batch(fake_repo, items, max_concurrency=2))
+
+    assert [r.final_answer for r in results] == [f"Mock answer for: question {i}?" for i in range(3)]
+
+
+def test_run_rlm_injected_rootlm_handles_decision(fake_repo) -> None:
+    stages: list[str] = []
+
+    class RecordingRootLM(MockRootLM):
+        def generate_program(self, *args, **kwargs):
+            stages.append("plan")
+            return super().generate_program(*args, **kwargs)
+
+        def generate_final(self, *args, **kwargs):
+            stages.append("decision")
+            return super().generate_final(*args, **kwargs)
+
+    options = {"executor_backend": "real", "rootlm_backend": "vllm"}
+    result = run_rlm(fake_repo, "s1", "what is this?", options, rootlm=RecordingRootLM())
+
+    assert result.status == "ok"
+    assert stages == ["plan", "decision"]
+
+
+def test_run_rlm_injected_rootlm_decision_falls_back_to_mock(fake_repo) -> None:
+    class FailingRootLM(MockRootLM):
+        mode = "vllm"
 
+        def generate_final(self, *args, **kwargs):
+            raise TimeoutError("vllm unavailable")
 
-def test_run_rlm_decision_vllm_fallback(monkeypatch, tmp_path) -> None:
-    monkeypatch.setenv("RLM_TRACE_DIR", str(tmp_path))
-    repo = _FakeRepo()
+    result = run_rlm(fake_repo, "s1", "what is this?", {"executor_backend": "real"}, rootlm=FailingRootLM())
+
+    meta = fake_repo.payloads[-1]["meta"]
+    assert result.status == "ok"
+    assert result.final_answer == "Mock answer for: what is this?"
+    assert meta["round3"]["fallback_reason"].startswith("vllm_request_failed: TimeoutError")
+    assert meta["round3"]["fallback_from"] == "vllm"
+
+
+def test_run_rlm_plan_error_writes_full_row(fake_repo) -> None:
+    class FailingPlanRootLM(MockRootLM):
+        def generate_program(self, *args, **kwargs):
+            raise RuntimeError("plan failed")
+
+    result = run_rlm(fake_repo, "s1", "what is this?", {"executor_backend": "real"}, rootlm=FailingPlanRootLM())
+
+    (write,) = fake_repo.payloads
+    assert result.status == "error"
+    assert write["glimpses"] == [] and write["evidence"] == [] and write["citations"] == []
+    assert write["final"] == {} and write["final_answer"] is None
+
+
+def test_run_rlm_decision_vllm_fallback(fake_repo) -> None:
     options = {
         "executor_backend": "real",
         "rootlm_backend": "vllm",
         "vllm_base_url": "http://127.0.0.1:1/v1",
         "vllm_model": "TinyLlama/TinyLlama-1.1B-Chat-v1.0",
     }
-    result = run_rlm(repo, "s1", "what is this?", options)
+    result = run_rlm(fake_repo, "s1", "what is this?", options)
 
     steps = result.program.get("steps") if isinstance(result.program, dict) else None
     assert result.status == "ok"
@@ -104,28 +122,88 @@ def test_run_rlm_decision_vllm_fallback(monkeypatch, tmp_path) -> None:
     assert result.final_answer.startswith("Mock answer for:")
 
 
-def test_run_rlm_decision_vllm_timeout_sets_fallback(monkeypatch, tmp_path) -> None:
-    monkeypatch.setenv("RLM_TRACE_DIR", str(tmp_path))
+def test_run_rlm_decision_vllm_timeout_sets_fallback(monkeypatch, fake_repo) -> None:
+    retries: list[int] = []
 
     class FakeAdapter:
         def __init__(self, *args, **kwargs) -> None:
-            pass
+            retries.append(kwargs["retry"].max_retries)
 
         def generate(self, *args, **kwargs) -> str:
             raise TimeoutError("simulated timeout")
 
     monkeypatch.setattr("app.rlm.services.run_pipeline.InferenceVllmAdapter", FakeAdapter)
+    monkeypatch.setenv("RLM_VLLM_MAX_RETRIES", "0")
 
-    repo = _FakeRepo()
     options = {
         "executor_backend": "real",
         "rootlm_backend": "vllm",
         "vllm_base_url": "http://127.0.0.1:1/v1",
         "vllm_model": "TinyLlama/TinyLlama-1.1B-Chat-v1.0",
     }
-    result = run_rlm(repo, "s1", "what is this?", options)
+    result = run_rlm(fake_repo, "s1", "what is this?", options)
 
     assert result.status == "ok"
     assert result.final_answer.startswith("Mock answer for:")
-    meta = repo.payloads[-1]["meta"]
+    meta = fake_repo.payloads[-1]["meta"]
     assert meta.get("round3", {}).get("fallback_reason")
+    assert retries == [0]
+
+
+def test_extract_json_payload_variants() -> None:
+    assert _extract_json_payload('{"final": {"answer": "ok"}}') == {"final": {"answer": "ok"}}
+    assert _extract_json_payload('```json\n{"program": {"steps": []}}\n```') == {"program": {"steps": []}}
+    assert _extract_json_payload('Sure: {"final": {"answer": "é"}} done') == {"final": {"answer": "é"}}
+    assert _extract_json_payload("   ") is None
+    assert _extract_json_payload("no json here") is None
+    assert _extract_json_payload("Paris.") is None
+    assert _extract_json_payload('note {a} ```json\n{"answer": 1}\n```') == {"answer": 1}
+    assert _extract_json_payload("use {a} and {b}") is None
+
+
+def test_vllm_rootlm_response_cache_reuses_final() -> None:
+    calls: list[str] = []
+
+    class CountingAdapter:
+        def generate(self, prompt: str, timeout_s=None, options=None) -> str:
+            calls.append(prompt)
+            return '{"final": {"answer": "cached", "citations": []}}'
+
+    rootlm = VllmRootLM(base_url="http://example.com", api_key=None, model="m1", temperature=0)
+    rootlm._adapter = CountingAdapter()  # type: ignore[attr-defined]
+    index = CandidateIndex(session_id="s1", project_id="p1", query="cache me", candidates=[])
+    options = {"rlm_response_cache_enabled": True}
+
+    first = rootlm.generate_final(index, events=[], glimpses=[], subcalls=[], options=options)
+    second = rootlm.generate_final(index, events=[], glimpses=[], subcalls=[], options=options)
+    rootlm.generate_final(index, events=[], glimpses=[], subcalls=[], options={})
+
+    assert first.final == second.final == {"answer": "cached", "citations": []}
+    assert second.meta.get("cache_hit") is True
+    assert len(calls) == 2
+
+    first.final["citations"].append("leak")
+    second.final["citations"].append("leak")
+    third = rootlm.generate_final(index, events=[], glimpses=[], subcalls=[], options=options)
+    assert third.final == {"answer": "cached", "citations": []}
+
+
+def test_vllm_rootlm_response_cache_skips_unparsed_replies() -> None:
+    calls: list[str] = []
+
+    class PlainTextAdapter:
+        def generate(self, prompt: str, timeout_s=None, options=None) -> str:
+            calls.append(prompt)
+            return "Paris."
+
+    rootlm = VllmRootLM(base_url="http://example.com", api_key=None, model="m2", temperature=0)
+    rootlm._adapter = PlainTextAdapter()  # type: ignore[attr-defined]
+    index = CandidateIndex(session_id="s1", project_id="p1", query="capital?", candidates=[])
+    options = {"rlm_response_cache_enabled": True}
+
+    first = rootlm.generate_final(index, events=[], glimpses=[], subcalls=[], options=options)
+    rootlm.generate_final(index, events=[], glimpses=[], subcalls=[], options=options)
+
+    assert first.final == {"answer": "Paris.", "citations": []}
+    assert first.meta["parsed"] is False
+    assert len(calls) == 2
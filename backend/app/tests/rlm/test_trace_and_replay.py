@@ -1,19 +1,7 @@
 from __future__ import annotations
 
-import importlib.util
-from pathlib import Path
-
-from app.rlm.services.trace_logger import TraceLogger
-
-
-def _load_replay_module() -> object:
-    script_path = Path(__file__).resolve().parents[3] / "scripts" / "replay_rlm_run.py"
-    spec = importlib.util.spec_from_file_location("replay_rlm_run", script_path)
-    if not spec or not spec.loader:
-        raise RuntimeError("failed_to_load_replay_module")
-    module = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(module)
-    return module
+from app.rlm.services.replay import _replay
+from app.rlm.services.trace_logger import TraceLogger, flush_trace_queue, get_trace_logger
 
 
 def test_trace_logger_and_replay(tmp_path, capsys) -> None:
@@ -22,11 +10,28 @@ def test_trace_logger_and_replay(tmp_path, capsys) -> None:
     logger.append(stage="examine", payload={"events_count": 2, "glimpses_count": 1})
     logger.append(stage="decision", payload={"final_answer_preview": "ok", "citations_count": 0})
 
-    module = _load_replay_module()
-    exit_code = module._replay(tmp_path / "run-1.jsonl")
+    exit_code = _replay(tmp_path / "run-1.jsonl")
 
     captured = capsys.readouterr()
     assert exit_code == 0
     assert "plan steps=1" in captured.out
     assert "examine events=2" in captured.out
     assert "decision answer=ok" in captured.out
+
+    assert _replay(tmp_path / "run-1.jsonl", count_only=True) == 0
+    assert capsys.readouterr().out == "records=3\n"
+
+
+def test_background_trace_logger_writes_after_flush(tmp_path) -> None:
+    logger = get_trace_logger("run-2", trace_dir=tmp_path, background=True)
+    payload = {"steps_count": 1}
+    logger.append(stage="plan", payload=payload)
+    payload["steps_count"] = 99
+    logger.append_error(stage="error", error="boom", meta={"round": "round2"})
+    flush_trace_queue()
+
+    lines = (tmp_path / "run-2.jsonl").read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 2
+    assert '"stage":"plan"' in lines[0]
+    assert '"steps_count":1' in lines[0]
+    assert '"error":"boom"' in lines[1]
@@ -10,10 +10,11 @@ Checks:
 from __future__ import annotations
 
 import argparse
+import http.client
 import json
 import os
 import sys
-import urllib.error
+import urllib.parse
 import urllib.request
 from typing import Any, Optional
 
@@ -41,23 +42,62 @@ def _normalize_base_url(base_url: str) -> str:
     return trimmed
 
 
-def _request_json(
-    url: str,
-    *,
-    method: str = "GET",
-    body: dict[str, Any] | None = None,
-    headers: dict[str, str] | None = None,
-    timeout_s: float = 10.0,
-) -> dict[str, Any]:
-    payload = None
-    request_headers = dict(headers or {})
-    if body is not None:
-        payload = json.dumps(body).encode("utf-8")
-        request_headers.setdefault("Content-Type", "application/json")
-    request = urllib.request.Request(url, data=payload, headers=request_headers, method=method)
-    with urllib.request.urlopen(request, timeout=timeout_s) as response:
-        raw = response.read().decode("utf-8")
-    return json.loads(raw)
+class _VllmConnection:
+    """
+    One keep-alive connection shared by every request of the check. When a
+    *_proxy variable covers the host, or the server answers with a redirect,
+    requests go through urlopen instead, which honours both.
+    """
+
+    def __init__(self, base_url: str, *, headers: dict[str, str], timeout_s: float) -> None:
+        parts = urllib.parse.urlsplit(base_url)
+        self._base_url = base_url
+        self._timeout_s = timeout_s
+        self._conn: http.client.HTTPConnection | None = None
+        proxied = bool(urllib.request.getproxies().get(parts.scheme)) and not urllib.request.proxy_bypass(
+            parts.hostname or ""
+        )
+        if not proxied:
+            connection_cls = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+            self._conn = connection_cls(parts.hostname or "", parts.port, timeout=timeout_s)
+        self._prefix = parts.path.rstrip("/")
+        self._headers = headers
+
+    def request_json(
+        self,
+        path: str,
+        *,
+        method: str = "GET",
+        body: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        payload = None
+        request_headers = dict(self._headers)
+        if body is not None:
+            payload = json.dumps(body).encode("utf-8")
+            request_headers["Content-Type"] = "application/json"
+        if self._conn is not None:
+            self._conn.request(
+                method,
+                f"{self._prefix}{path}",
+                body=payload,
+                headers={"Connection": "keep-alive", **request_headers},
+            )
+            response = self._conn.getresponse()
+            # Read the whole body before the next request reuses the socket.
+            raw = response.read()
+            if not 300 <= response.status < 400:
+                if response.status >= 400:
+                    raise ValueError(f"HTTP {response.status} {response.reason} from {path}")
+                return json.loads(raw)
+        request = urllib.request.Request(
+            f"{self._base_url}{path}", data=payload, headers=request_headers, method=method
+        )
+        with urllib.request.urlopen(request, timeout=self._timeout_s) as response:
+            return json.loads(response.read())
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
 
 
 def _extract_model_ids(payload: dict[str, Any]) -> list[str]:
@@ -82,8 +122,7 @@ def _extract_completion_text(payload: dict[str, Any]) -> str:
     if not choices:
         raise ValueError("vLLM response missing choices")
     first = choices[0] or {}
-    message = first.get("message") or {}
-    content = message.get("content")
+    content = (first.get("message") or {}).get("content")
     if content is None:
         content = first.get("text")
     if content is None:
@@ -92,7 +131,8 @@ def _extract_completion_text(payload: dict[str, Any]) -> str:
 
 
 def _preview_text(text: str, limit: int = 120) -> str:
-    cleaned = text.replace("\n", " ").strip()
+    cleaned = text.replace("\n", " ") if "\n" in text else text
+    cleaned = cleaned.strip()
     if len(cleaned) > limit:
         return f"{cleaned[:limit]}..."
     return cleaned
@@ -119,17 +159,16 @@ def main(argv: list[str] | None = None) -> int:
     if api_key:
         headers["Authorization"] = f"Bearer {api_key}"
 
+    client = _VllmConnection(base_url, headers=headers, timeout_s=timeout_s)
     try:
-        models_payload = _request_json(f"{base_url}/models", headers=headers, timeout_s=timeout_s)
+        models_payload = client.request_json("/models")
         model_ids = _extract_model_ids(models_payload)
         if not model:
             model = model_ids[0]
 
-        completion_payload = _request_json(
-            f"{base_url}/chat/completions",
+        completion_payload = client.request_json(
+            "/chat/completions",
             method="POST",
-            headers=headers,
-            timeout_s=timeout_s,
             body={
                 "model": model,
                 "messages": [{"role": "user", "content": "ping"}],
@@ -138,12 +177,14 @@ def main(argv: list[str] | None = None) -> int:
             },
         )
         completion = _extract_completion_text(completion_payload)
-    except (urllib.error.URLError, urllib.error.HTTPError, TimeoutError, ValueError) as exc:
+    except (OSError, http.client.HTTPException, ValueError) as exc:
         print(f"Error: vLLM connectivity check failed: {exc}", file=sys.stderr)
         return 2
     except Exception as exc:  # noqa: BLE001
         print(f"Error: unexpected failure: {exc}", file=sys.stderr)
         return 3
+    finally:
+        client.close()
 
     snippet = ", ".join(model_ids[:3])
     print(f"OK models: {snippet}")
@@ -7,7 +7,7 @@ import json
 import os
 import sys
 import urllib.request
-from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 from urllib.error import HTTPError, URLError
 
@@ -35,41 +35,66 @@ from app.rlm.adapters.repos_sql import RlmRepoSQL
 from app.rlm.services.rlm_pipeline import RunResult, run_rlm
 
 
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Built once so SQLAlchemy reuses the same statement objects across calls.
+_SQL_CREATE_PROJECT_SESSION = text(
+    """
+    with inserted as (
+        insert into projects (name) values (:name)
+        on conflict (name) do nothing
+        returning id
+    ), project as (
+        select id from inserted
+        union all
+        select id from projects where name = :name
+        limit 1
+    )
+    insert into sessions (project_id)
+    select id from project
+    returning project_id::text as project_id, id::text as id
+    """
+)
+_SQL_SELECT_EXISTING_ARTIFACTS = text(
+    """
+    select id::text as id, session_id::text as session_id, scope, type, content_hash
+    from artifacts
+    where project_id = :project_id
+      and content_hash = any(:content_hashes)
+      and status = 'active'
+    """
+)
+
+
+@lru_cache(maxsize=1024)
 def _hash_content(content: str) -> str:
     return hashlib.sha256(content.encode("utf-8")).hexdigest()
 
 
 def _estimate_tokens(content: str) -> int:
-    return max(1, len(content.split()))
-
+    # ~4 characters per token; no intermediate word list
+    return max(1, (len(content) + 3) // 4)
 
-def _get_or_create_project_id(conn, name: str) -> str:
-    row = conn.execute(
-        text("select id::text as id from projects where name = :name"),
-        {"name": name},
-    ).mappings().first()
-    if row:
-        return row["id"]
 
-    row = conn.execute(
-        text("insert into projects (name) values (:name) returning id::text as id"),
-        {"name": name},
-    ).mappings().one()
-    return row["id"]
+def _create_project_session(conn, name: str) -> tuple[str, str]:
+    # Get-or-create the project and open a session for it in one round-trip.
+    row = conn.execute(_SQL_CREATE_PROJECT_SESSION, {"name": name}).mappings().one()
+    return row["project_id"], row["id"]
 
 
-def _create_session(conn, project_id: str) -> str:
-    row = conn.execute(
-        text(
-            "insert into sessions (project_id) values (:project_id) returning id::text as id"
-        ),
-        {"project_id": project_id},
-    ).mappings().one()
-    return row["id"]
+_ARTIFACT_ROW_KEYS = (
+    "session_id",
+    "scope",
+    "type",
+    "title",
+    "content",
+    "content_hash",
+    "token_estimate",
+    "source",
+)
 
 
 def _insert_artifacts(conn, project_id: str, session_id: str) -> list[str]:
-    now = datetime.now(timezone.utc).isoformat()
     artifacts = [
         {
             "scope": "global",
@@ -97,84 +122,78 @@ def _insert_artifacts(conn, project_id: str, session_id: str) -> list[str]:
         },
     ]
 
-    inserted_ids: list[str] = []
-    for artifact in artifacts:
-        content = artifact["content"]
-        row = conn.exec_driver_sql(
-            """
-            insert into artifacts (
-                project_id,
-                session_id,
-                scope,
-                type,
-                title,
-                content,
-                content_hash,
-                token_estimate,
-                metadata,
-                source,
-                status,
-                created_at,
-                updated_at
-            ) values (
+    rows = [
+        {
+            **artifact,
+            "content_hash": _hash_content(artifact["content"]),
+            "token_estimate": _estimate_tokens(artifact["content"]),
+        }
+        for artifact in artifacts
+    ]
+    params: dict[str, object] = {
+        "project_id": project_id,
+        "metadata": json.dumps({"demo_inserted": True}),
+    }
+    values_sql: list[str] = []
+    for idx, row in enumerate(rows):
+        for key in _ARTIFACT_ROW_KEYS:
+            params[f"{key}_{idx}"] = row[key]
+        values_sql.append(
+            f"""(
                 %(project_id)s,
-                %(session_id)s,
-                %(scope)s,
-                %(type)s,
-                %(title)s,
-                %(content)s,
-                %(content_hash)s,
-                %(token_estimate)s,
-                COALESCE(%(metadata)s, '{}')::jsonb,
-                %(source)s,
-                'active',
-                %(created_at)s,
-                %(updated_at)s
-            )
-            on conflict do nothing
-            returning id::text as id
-            """,
+                %(session_id_{idx})s,
+                %(scope_{idx})s,
+                %(type_{idx})s,
+                %(title_{idx})s,
+                %(content_{idx})s,
+                %(content_hash_{idx})s,
+                %(token_estimate_{idx})s,
+                COALESCE(%(metadata)s, '{{}}')::jsonb,
+                %(source_{idx})s,
+                'active'
+            )"""
+        )
+
+    # One multi-row INSERT for all artifacts, then one SELECT for any rows
+    # that already existed (ON CONFLICT skipped them, so RETURNING omits them).
+    returned = conn.exec_driver_sql(
+        f"""
+        insert into artifacts (
+            project_id,
+            session_id,
+            scope,
+            type,
+            title,
+            content,
+            content_hash,
+            token_estimate,
+            metadata,
+            source,
+            status
+        ) values {", ".join(values_sql)}
+        on conflict do nothing
+        returning id::text as id, session_id::text as session_id, scope, type, content_hash
+        """,
+        params,
+    ).mappings().all()
+
+    def _key(row) -> tuple[str, str, str | None, str]:
+        return (row["scope"], row["type"], row["session_id"], row["content_hash"])
+
+    ids_by_key = {_key(row): row["id"] for row in returned}
+    missing = [row for row in rows if _key(row) not in ids_by_key]
+    if missing:
+        existing = conn.execute(
+            _SQL_SELECT_EXISTING_ARTIFACTS,
             {
                 "project_id": project_id,
-                "session_id": artifact["session_id"],
-                "scope": artifact["scope"],
-                "type": artifact["type"],
-                "title": artifact["title"],
-                "content": content,
-                "content_hash": _hash_content(content),
-                "token_estimate": _estimate_tokens(content),
-                "metadata": json.dumps({"demo_inserted": True}),
-                "source": artifact["source"],
-                "created_at": now,
-                "updated_at": now,
+                "content_hashes": [row["content_hash"] for row in missing],
             },
-        ).mappings().first()
-        if not row:
-            row = conn.execute(
-                text(
-                    """
-                    select id::text as id
-                    from artifacts
-                    where project_id = :project_id
-                      and scope = :scope
-                      and type = :type
-                      and session_id is not distinct from :session_id
-                      and content_hash = :content_hash
-                      and status = 'active'
-                    limit 1
-                    """
-                ),
-                {
-                    "project_id": project_id,
-                    "session_id": artifact["session_id"],
-                    "scope": artifact["scope"],
-                    "type": artifact["type"],
-                    "content_hash": _hash_content(content),
-                },
-            ).mappings().one()
-        inserted_ids.append(row["id"])
-
-    return inserted_ids
+        ).mappings().all()
+        for row in existing:
+            ids_by_key.setdefault(_key(row), row["id"])
+
+    return [ids_by_key[_key(row)] for row in rows]
 
 
 def _call_run(base_url: str, session_id: str, query: str) -> dict:
@@ -187,14 +206,13 @@ def _call_run(base_url: str, session_id: str, query: str) -> dict:
     req = urllib.request.Request(
         f"{base_url.rstrip('/')}/v1/rlm/run",
         data=data,
-        headers={"Content-Type": "application/json"},
+        headers=_JSON_HEADERS,
     )
     with urllib.request.urlopen(req) as response:
-        return json.loads(response.read().decode("utf-8"))
+        return json.loads(response.read())
 
 
-def _direct_run(session_id: str, query: str) -> RunResult:
-    engine = get_engine()
+def _direct_run(engine, session_id: str, query: str) -> RunResult:
     repo = RlmRepoSQL(engine)
     return run_rlm(repo, session_id, query, {"executor_backend": "real"})
 
@@ -215,7 +233,7 @@ def _vllm_preflight() -> bool:
             "stream": False,
         }
     ).encode("utf-8")
-    req = urllib.request.Request(url, data=payload, headers={"Content-Type": "application/json"})
+    req = urllib.request.Request(url, data=payload, headers=_JSON_HEADERS)
     try:
         with urllib.request.urlopen(req, timeout=timeout_s) as resp:
             return resp.status == 200
@@ -254,7 +272,9 @@ def _final_answer_preview(final_answer: str | None, final: dict | None) -> str:
             answer = str(raw)
     if not answer:
         return ""
-    answer = answer.replace("\n", " ").strip()
+    if "\n" in answer:
+        answer = answer.replace("\n", " ")
+    answer = answer.strip()
     if len(answer) > 300:
         return f"{answer[:300]}…"
     return answer
@@ -287,8 +307,7 @@ def _print_run_summary_from_result(result: RunResult) -> None:
     print(f"  final_answer preview: {final_preview}")
 
 
-def _print_rounds_for_run(run_id: str) -> None:
-    engine = get_engine()
+def _print_rounds_for_run(engine, run_id: str) -> None:
     with engine.connect() as conn:
         row = conn.execute(
             text("select meta from rlm_runs where id = :run_id"),
@@ -340,8 +359,7 @@ def main() -> int:
 
     engine = get_engine()
     with engine.begin() as conn:
-        project_id = _get_or_create_project_id(conn, args.project)
-        session_id = _create_session(conn, project_id)
+        project_id, session_id = _create_project_session(conn, args.project)
         artifact_ids = _insert_artifacts(conn, project_id, session_id)
 
     print(f"Inserted artifacts: {', '.join(artifact_ids)}")
@@ -356,7 +374,7 @@ def main() -> int:
     try:
         resp = _call_run(args.base_url, session_id, args.query)
         _print_run_summary(resp)
-        _print_rounds_for_run(resp.get("run_id"))
+        _print_rounds_for_run(engine, resp.get("run_id"))
     except Exception as exc:  # noqa: BLE001 - demo script should surface error
         print(f"Failed to call run API at {args.base_url}: {exc}", file=sys.stderr)
         print(
@@ -367,9 +385,9 @@ def main() -> int:
             file=sys.stderr,
         )
         try:
-            direct_result = _direct_run(session_id, args.query)
+            direct_result = _direct_run(engine, session_id, args.query)
             _print_run_summary_from_result(direct_result)
-            _print_rounds_for_run(direct_result.run_id)
+            _print_rounds_for_run(engine, direct_result.run_id)
         except Exception as direct_exc:  # noqa: BLE001 - demo script should surface error
             print(f"Direct runner invocation failed: {direct_exc}", file=sys.stderr)
             return 1
@@ -14,8 +14,8 @@ from app.rlm.services.run_pipeline import _build_compact_decision_messages  # ty
 
 def main() -> int:
     question = " ".join(sys.argv[1:]) or "What is this demo about?"
-    evidence = [{"glimpses": [{"text": "demo evidence text " * 10}]}]
-    messages = _build_compact_decision_messages(question, evidence)
+    glimpses = [{"text": "demo evidence text " * 10}]
+    messages = _build_compact_decision_messages(question, glimpses)
     total_chars = sum(len(m["content"]) for m in messages)
     print(f"messages={len(messages)} total_chars={total_chars}")
     for idx, msg in enumerate(messages, start=1):
@@ -3,7 +3,6 @@ from __future__ import annotations
 
 import hashlib
 import json
-from datetime import datetime, timezone
 
 from sqlalchemy import text
 
@@ -16,21 +15,28 @@ def _hash_content(content: str) -> str:
 
 
 def _estimate_tokens(content: str) -> int:
-    return max(1, len(content.split()))
+    # ~4 characters per token; no intermediate word list
+    return max(1, (len(content) + 3) // 4)
 
 
-def _get_or_create_project_id(conn, name: str) -> str:
-    row = conn.execute(
-        text("select id::text as id from projects where name = :name"),
-        {"name": name},
-    ).mappings().first()
-    if row:
-        return row["id"]
+_SQL_GET_OR_CREATE_PROJECT = text(
+    """
+    with inserted as (
+        insert into projects (name) values (:name)
+        on conflict (name) do nothing
+        returning id
+    )
+    select id::text as id from inserted
+    union all
+    select id::text as id from projects where name = :name
+    limit 1
+    """
+)
 
-    row = conn.execute(
-        text("insert into projects (name) values (:name) returning id::text as id"),
-        {"name": name},
-    ).mappings().one()
+
+def _get_or_create_project_id(conn, name: str) -> str:
+    # Same get-or-create idiom as demo_rlm.py: an existing row is read back, not rewritten.
+    row = conn.execute(_SQL_GET_OR_CREATE_PROJECT, {"name": name}).mappings().one()
     return row["id"]
 
 
@@ -42,61 +48,60 @@ def _create_session(conn, project_id: str) -> str:
     return row["id"]
 
 
+_SQL_INSERT_ARTIFACT = text(
+    """
+    insert into artifacts (
+        project_id,
+        session_id,
+        scope,
+        type,
+        title,
+        content,
+        content_hash,
+        token_estimate,
+        metadata,
+        source,
+        status
+    ) values (
+        :project_id,
+        :session_id,
+        'project',
+        :type,
+        :title,
+        :content,
+        :content_hash,
+        :token_estimate,
+        CAST(:metadata AS jsonb),
+        'test',
+        'active'
+    )
+    """
+)
+
+
 def _insert_artifacts(conn, project_id: str, session_id: str) -> None:
-    now = datetime.now(timezone.utc).isoformat()
+    metadata = json.dumps({"test_inserted": True})
     artifacts = [
         ("doc", "Doc artifact", "This is a doc artifact."),
         ("code", "Code artifact", "print('hello world')"),
         ("note", "Note artifact", "This is a note artifact."),
     ]
-    for artifact_type, title, content in artifacts:
-        conn.execute(
-            text(
-                """
-                insert into artifacts (
-                    project_id,
-                    session_id,
-                    scope,
-                    type,
-                    title,
-                    content,
-                    content_hash,
-                    token_estimate,
-                    metadata,
-                    source,
-                    status,
-                    created_at,
-                    updated_at
-                ) values (
-                    :project_id,
-                    :session_id,
-                    'project',
-                    :type,
-                    :title,
-                    :content,
-                    :content_hash,
-                    :token_estimate,
-                    :metadata::jsonb,
-                    'test',
-                    'active',
-                    :created_at,
-                    :updated_at
-                )
-                """
-            ),
-            {
-                "project_id": project_id,
-                "session_id": session_id,
-                "type": artifact_type,
-                "title": title,
-                "content": content,
-                "content_hash": _hash_content(content),
-                "token_estimate": _estimate_tokens(content),
-                "metadata": json.dumps({"test_inserted": True}),
-                "created_at": now,
-                "updated_at": now,
-            },
-        )
+    rows = [
+        {
+            "project_id": project_id,
+            "session_id": session_id,
+            "type": artifact_type,
+            "title": title,
+            "content": content,
+            "content_hash": _hash_content(content),
+            "token_estimate": _estimate_tokens(content),
+            "metadata": metadata,
+        }
+        for artifact_type, title, content in artifacts
+    ]
+    # One executemany call; the driver batches the rows instead of a
+    # round-trip per artifact.
+    conn.execute(_SQL_INSERT_ARTIFACT, rows)
 
 
 def main() -> int: